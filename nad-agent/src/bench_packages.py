@@ -0,0 +1,215 @@
+#!/usr/bin/env python3
+from __future__ import annotations
+
+import argparse
+import json
+import platform
+import sys
+import tempfile
+import time
+import tracemalloc
+from collections.abc import Callable
+from datetime import date, datetime, timedelta, timezone
+from pathlib import Path
+
+import generate_packages as gp
+
+BENCH_START = date(2026, 1, 5)
+SCALE_WORDS = ["Amber", "Velvet", "Hollow", "Quiet", "Midnight", "Silver", "Faded", "Slow", "Distant", "Blue"]
+SUFFIX_POOLS = ["MELANCHOLIC_PHRASES", "SUNO_TRACKLINE_POOL", "TAG_POOL", "OVERHEARD_QUOTES"]
+PREFIX_POOLS = ["NARRATIVE_LINES"]
+STAGES = [
+    "build_contexts",
+    "pick_week_phrases",
+    "build_week_microstories",
+    "build_week_tracklists",
+    "build_markdown",
+    "write_packages",
+]
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Benchmark the NAD package generator stage by stage")
+    parser.add_argument("--scales", default="1,10,100", help="Comma-separated synthetic pool scale factors.")
+    parser.add_argument("--horizons", default="1,52,520", help="Comma-separated horizon lengths in weeks.")
+    parser.add_argument("--repeat", type=int, default=3, help="Timing repetitions; the fastest run is kept.")
+    parser.add_argument("--no-memory", action="store_true", help="Skip the tracemalloc pass for memory peaks.")
+    parser.add_argument("--output", help="Write JSON results to this path.")
+    parser.add_argument("--baseline", help="Compare against a previous JSON result file.")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="Allowed slowdown ratio before flagging.")
+    args = parser.parse_args()
+    if args.repeat < 1:
+        parser.error("--repeat must be at least 1")
+    return args
+
+
+def scale_words(factor: int) -> list[str]:
+    combos = [f"{a} {b}" for a in SCALE_WORDS for b in SCALE_WORDS]
+    if factor - 1 > len(combos):
+        raise ValueError(f"Scale factor {factor} exceeds {len(combos) + 1}")
+    return combos[: factor - 1]
+
+
+def scaled_pool(pool: list[str], factor: int, prefix: bool = False) -> list[str]:
+    out = list(pool)
+    for words in scale_words(factor):
+        if prefix:
+            out.extend(f"{words}, {line[0].lower()}{line[1:]}" for line in pool)
+        else:
+            out.extend(f"{line} {words}" for line in pool)
+    return out
+
+
+def apply_scale(factor: int) -> dict[str, object]:
+    originals = {name: getattr(gp, name) for name in SUFFIX_POOLS + PREFIX_POOLS}
+    if factor > 1:
+        for name in SUFFIX_POOLS:
+            setattr(gp, name, scaled_pool(list(originals[name]), factor))
+        for name in PREFIX_POOLS:
+            setattr(gp, name, scaled_pool(list(originals[name]), factor, prefix=True))
+    return originals
+
+
+def restore_pools(originals: dict[str, object]) -> None:
+    for name, pool in originals.items():
+        setattr(gp, name, pool)
+
+
+def run_pipeline(weeks: int, out_dir: Path, measure: Callable[[str, Callable[[], object]], object]) -> None:
+    bases = [BENCH_START + timedelta(weeks=i) for i in range(weeks)]
+    horizon = measure("build_contexts", lambda: [gp.build_contexts(b) for b in bases])
+    phrase_maps = measure("pick_week_phrases", lambda: [gp.pick_week_phrases(c) for c in horizon])
+    concepts = [set() for _ in horizon]
+    story_maps = measure(
+        "build_week_microstories",
+        lambda: [gp.build_week_microstories(c, u) for c, u in zip(horizon, concepts)],
+    )
+    tracklist_maps = measure(
+        "build_week_tracklists",
+        lambda: [gp.build_week_tracklists(c, p, u) for c, p, u in zip(horizon, phrase_maps, concepts)],
+    )
+
+    def render() -> list[tuple[str, str]]:
+        rendered: list[tuple[str, str]] = []
+        for contexts, phrases, stories, tracks in zip(horizon, phrase_maps, story_maps, tracklist_maps):
+            for ctx in contexts:
+                key = ctx.publish_date.isoformat()
+                markdown = gp.build_markdown(ctx, phrases[key], stories[key], tracks[key])
+                rendered.append((gp.package_filename(ctx), markdown))
+        return rendered
+
+    rendered = measure("build_markdown", render)
+    measure("write_packages", lambda: gp.write_rendered(rendered, out_dir))
+
+
+def time_case(weeks: int, repeat: int) -> dict[str, float]:
+    best: dict[str, float] = {}
+    for _ in range(repeat):
+        with tempfile.TemporaryDirectory() as tmp:
+            timings: dict[str, float] = {}
+
+            def measure(stage: str, fn: Callable[[], object]) -> object:
+                start = time.perf_counter()
+                result = fn()
+                timings[stage] = time.perf_counter() - start
+                return result
+
+            run_pipeline(weeks, Path(tmp), measure)
+        for stage, seconds in timings.items():
+            best[stage] = min(seconds, best.get(stage, seconds))
+    return best
+
+
+def memory_case(weeks: int) -> dict[str, int]:
+    peaks: dict[str, int] = {}
+    with tempfile.TemporaryDirectory() as tmp:
+
+        def measure(stage: str, fn: Callable[[], object]) -> object:
+            tracemalloc.start()
+            try:
+                result = fn()
+                peaks[stage] = tracemalloc.get_traced_memory()[1]
+            finally:
+                tracemalloc.stop()
+            return result
+
+        run_pipeline(weeks, Path(tmp), measure)
+    return peaks
+
+
+def run_benchmarks(scales: list[int], horizons: list[int], repeat: int, memory: bool) -> list[dict]:
+    results: list[dict] = []
+    for factor in scales:
+        originals = apply_scale(factor)
+        try:
+            gp.build_contexts(BENCH_START)
+            gp.pool_index()
+            for weeks in horizons:
+                timings = time_case(weeks, repeat)
+                peaks = memory_case(weeks) if memory else {}
+                for stage in STAGES:
+                    results.append(
+                        {
+                            "scale": factor,
+                            "weeks": weeks,
+                            "stage": stage,
+                            "seconds": round(timings[stage], 6),
+                            "peak_bytes": peaks.get(stage),
+                        }
+                    )
+                print(
+                    f"scale={factor:<4} weeks={weeks:<4} "
+                    + " ".join(f"{stage}={timings[stage] * 1000:.1f}ms" for stage in STAGES),
+                    file=sys.stderr,
+                )
+        finally:
+            restore_pools(originals)
+    return results
+
+
+def compare(results: list[dict], baseline: list[dict], tolerance: float) -> list[str]:
+    previous = {(r["scale"], r["weeks"], r["stage"]): r for r in baseline}
+    regressions: list[str] = []
+    for row in results:
+        old = previous.get((row["scale"], row["weeks"], row["stage"]))
+        if old is None or not old["seconds"]:
+            continue
+        ratio = row["seconds"] / old["seconds"]
+        if ratio > 1 + tolerance and row["seconds"] - old["seconds"] > 0.001:
+            regressions.append(
+                f"scale={row['scale']} weeks={row['weeks']} {row['stage']}: "
+                f"{old['seconds'] * 1000:.1f}ms -> {row['seconds'] * 1000:.1f}ms ({ratio:.2f}x)"
+            )
+    return regressions
+
+
+def main() -> None:
+    args = parse_args()
+    scales = [int(x) for x in args.scales.split(",") if x]
+    horizons = [int(x) for x in args.horizons.split(",") if x]
+    report = {
+        "meta": {
+            "generated_at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "generator_version": gp.GENERATOR_VERSION,
+            "pool_hash": gp.get_catalog().digest,
+            "repeat": args.repeat,
+        },
+        "results": run_benchmarks(scales, horizons, args.repeat, memory=not args.no_memory),
+    }
+    if args.output:
+        Path(args.output).write_text(json.dumps(report, indent=2) + "\n", encoding="utf-8")
+
+    if args.baseline:
+        baseline = json.loads(Path(args.baseline).read_text(encoding="utf-8"))
+        regressions = compare(report["results"], baseline["results"], args.tolerance)
+        for line in regressions:
+            print(f"REGRESSION {line}")
+        if regressions:
+            sys.exit(1)
+        print("No regressions against baseline.")
+
+
+if __name__ == "__main__":
+    main()
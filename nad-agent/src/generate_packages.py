@@ -1,155 +1,263 @@
 #!/usr/bin/env python3
 from __future__ import annotations
 
-import argparse
 import hashlib
+import os
 import random
 import re
-from dataclasses import dataclass
+from collections.abc import Container, Iterable, Iterator, Sequence
+from dataclasses import dataclass, field, replace
 from datetime import date, datetime, timedelta
+from functools import lru_cache, reduce, wraps
+from itertools import combinations, groupby, islice
+from math import gcd
+from operator import and_
 from pathlib import Path
-from zoneinfo import ZoneInfo
+from typing import TYPE_CHECKING
 
-TZ = ZoneInfo("America/Chihuahua")
-SERIES = ["After Hours", "Bar Conversations", "Midnight Service"]
-PUBLISH_WEEKDAYS = {1: "TUE", 3: "THU", 5: "SAT"}
-DURATION_SECONDS_RANGE = (3900, 5100)  # 1:05:00 to 1:25:00
-TITLE_SUFFIX = "Dark Noir Jazz Mix (Late Night Bar Ambience)"
-
-PRIMARY_OBJECTS = [
-    "ashtray", "door", "seat", "glass", "coat", "jukebox", "neon", "stool", "counter", "window", "bottle", "whiskey",
-]
-
-KEYWORD_POOL = [
-    "noir jazz bar ambience",
-    "late-night jazz bar",
-    "smoky jazz bar ambience",
-    "rainy night jazz bar ambience",
-    "midnight jazz bar ambience",
-    "quiet late-night jazz bar",
-]
-
-MELANCHOLIC_PHRASES = [
-    "You Can Leave The Light On", "I Kept Your Seat Warm", "We Stayed Until The Rain", "You Said Nothing For Hours",
-    "The Ice Melted Before Words", "I Heard You At Closing", "You Looked Past The Neon", "No One Asked Why Tonight",
-    "I Poured Another Quiet One", "The Room Felt Smaller Tonight", "Your Coat Still Smelled Like Rain", "We Let The Song Finish",
-    "You Smiled Then Looked Away", "I Never Cleared Your Glass", "The Door Chime Sounded Lonely", "We Talked In Half Sentences",
-    "I Counted Empty Stools Again", "You Stayed Past Last Call", "The Rain Answered For You", "You Asked For Something Soft",
-    "I Kept The Volume Low", "You Held The Warm Glass", "The Night Sat Between Us", "I Let The Silence Breathe",
-    "You Said You Were Fine", "I Pretended To Believe You", "Your Voice Fell With The Rain", "No One Touched The Jukebox",
-    "I Rinsed Glasses Very Slowly", "You Watched The Streetlights Fade", "The Bar Top Held Your Hands", "We Waited Out Another Storm",
-    "You Whispered Not Tonight", "I Nodded And Poured", "The Neon Trembled On Glass", "We Shared A Quiet Cigarette",
-    "I Heard Your Tired Laugh", "You Left Before The Chorus", "The Piano Stayed After Hours", "I Closed The Door Gently",
-    "You Came In Soaking Wet", "I Knew You Needed Quiet", "The Ashtray Filled With Rain", "You Asked If It Gets Better",
-    "I Said Stay A Minute", "The Clock Moved Like Smoke", "You Watched The Bourbon Spin", "I Wiped The Counter Twice",
-    "You Looked Like Last Winter", "The Street Was All Reflections", "I Saved The Corner Booth", "You Traced Circles On Wood",
-    "I Heard The Hurt In You", "The Window Caught Your Sigh", "You Asked For The Same Song", "I Let It Play Again",
-    "The Room Forgot To Breathe", "You Talked To Your Shadow", "I Kept The Night Soft", "You Left A Ring On Oak",
-    "I Remembered Your Last Goodbye", "You Stayed For One More", "The Rain Hid Your Face", "I Served The Silence Neat",
-    "You Said Dont Ask Me", "I Did Not Ask", "The Neon Made Us Honest", "You Held Back Every Word",
-    "I Heard The Street Cry", "You Looked Through Me Gently", "The Glassware Sang Quietly", "I Counted To Closing Again",
-    "You Asked For No Questions", "I Dimmed The Back Light", "The Door Closed Like A Whisper", "You Sat Where She Sat",
-    "I Knew Before You Spoke", "You Left Your Change Behind", "The Booth Stayed Warm", "I Saw Rain In Your Eyes",
-    "You Said It Was Nothing", "I Poured Something Gentle", "The Night Needed Less Noise", "You Stayed For The Slow Song",
-    "I Heard Your Chair Creak", "You Asked For Another Minute", "The Alley Stayed Blue", "I Could Not Fill The Quiet",
-    "You Looked At The Empty Stool", "I Polished The Same Glass", "The Rain Kept Time Outside", "You Whispered Keep It Low",
-    "I Let The Bassline Linger", "You Waited For Last Orders", "The Mirror Held Your Silence", "I Knew Youd Be Back",
-    "You Said Dont Turn It Up", "I Left The Door Unlocked", "The Night Leaned On The Bar", "You Breathed In Wood Smoke",
-    "I Heard The Chime Twice", "You Stayed Until Lights Dimmed", "The Counter Knew Your Hands", "I Let The Rain Play",
-    "You Asked If Anyone Stays", "I Said Some Of Us Do", "The Glass Fogged Then Cleared", "You Looked At Nothing Long",
-]
-
-NARRATIVE_LINES = [
-    "I stand behind the bar and keep the room soft enough for heavy thoughts.",
-    "From behind the bar, I watch rain slide down neon like tired handwriting.",
-    "I rinse the same glass twice while the piano settles into the wood.",
-    "I keep my voice low because the night already sounds bruised.",
-    "Behind the bar, I read shoulders before I read faces.",
-    "I wipe the counter slowly and let the silence sit between chords.",
-    "I line up empty tumblers like small confessions no one signed.",
-    "I keep the amber light low so nobody has to explain themselves.",
-    "Behind the bar, I can hear rain before the door even opens.",
-    "I nod, pour, and let people borrow the dark for a while.",
-    "I watch lonely stools hold more stories than crowded tables.",
-    "Behind the bar, every pause sounds like a memory coming back.",
-    "I polish the bar rail and leave one lamp burning above the bottles.",
-    "From this side of the counter, old songs feel like unfinished letters.",
-    "I keep the back door cracked so the rain can breathe with us.",
-    "Behind the bar, I hear apologies before they reach the glass.",
-    "I count clean tumblers and try not to count regrets.",
-    "I let the bassline travel slowly through the empty stools.",
-    "Behind the bar, the mirror remembers everyone longer than I do.",
-    "I watch a ring of water widen around a forgotten drink.",
-    "From behind the bar, each quiet nod sounds like a confession.",
-    "I pull another bottle down and keep the pour gentle.",
-    "Behind the bar, rain and neon take turns on the window.",
-    "I leave space between notes so no one has to explain tonight.",
-]
-
-OVERHEARD_QUOTES = [
-    "You okay?", "I'll stay a minute.", "Don't make it loud.", "Leave the door cracked.", "I just needed somewhere warm.",
-    "Can you keep the lights low?", "Not tonight, just music.", "Pour the same as last time.", "I don't want to talk about it.",
-    "Let the song finish first.", "You can stop asking now.", "I thought I'd feel better by now.", "Can I sit here a little longer?",
-    "No rush, I know you're closing.",
-]
+from nad_calendar import EPOCH, WEEKDAY_LABELS, Calendar, parse_dates, parse_rule
+from nad_catalog import CatalogPool, get_catalog, refresh_catalogs
+from nad_grammar import BloomFilter, Grammar
+from nad_rng import StreamRandom, root_key, substream_key
 
-SEO_CONTEXT = ["jazz for reading", "jazz for studying", "jazz for work"]
-ABOUT_NAD_LINES = [
-    "Notes After Dark (NAD) curates melancholic jazz-noir worlds for late hours.",
-    "Rain, neon, smoke, and quiet conversation shape every release.",
-    "Built for listeners who need focus, calm, and a little shelter after midnight.",
-]
-OPTIONAL_LATE_LINES = [
-    "If you're still awake, this room is yours for a little while.",
-    "For anyone working through the night, keep the volume low and stay with us.",
-    "If the city feels too loud tonight, let this mix breathe beside you.",
-    "For late-night listeners, this one is a gentle place to land.",
-]
+if TYPE_CHECKING:
+    import argparse
+    from zoneinfo import ZoneInfo
 
-TAG_POOL = [
-    "noir jazz", "dark noir jazz", "late-night bar ambience", "noir jazz bar ambience", "late-night jazz bar",
-    "smoky jazz bar ambience", "midnight jazz ambience", "jazz bar atmosphere", "melancholic jazz mix", "rainy night jazz",
-    "neon bar ambience", "faceless bartender vibe", "soft piano noir jazz", "saxophone night jazz", "quiet bar music",
-    "jazz for reading", "jazz for studying", "jazz for work", "after hours jazz", "city rain jazz ambience",
-    "cinematic jazz noir", "night writing music", "late-night focus music", "moody instrumental jazz", "urban night jazz",
-    "empty stool ambience", "last call jazz", "cigarette glow ambience", "wood bar top ambience", "slow burn jazz",
-    "notes after dark", "NAD jazz", "lonely bar soundtrack", "midnight lounge jazz", "soft neon jazz",
-]
+    from nad_ledger import UsageLedger
+    from nad_seo import SeoCorpus
+    from nad_stats import RunStats
 
-CHAPTER_MOMENTS = [
-    "Door Chime In The Rain", "Glass Rinse, Neon Drip", "Empty Stool By The Window", "Cigarette Glow In The Corner",
-    "Quiet Confession At The Counter", "Ice Bucket, Slow Pour", "Rain On The Back Door", "Half-Finished Drink, Soft Piano",
-    "Last Order In A Low Voice", "Last Call, Slow Footsteps", "Lights Dim Over Wet Wood",
-]
+TZ_NAME = "America/Chihuahua"
+SERIES = ("After Hours", "Bar Conversations", "Midnight Service")
+PUBLISH_WEEKDAYS = {1: "TUE", 3: "THU", 5: "SAT"}
+DURATION_SECONDS_RANGE = (3900, 5100)  # 1:05:00 to 1:25:00
+TITLE_SUFFIX = "Dark Noir Jazz Mix (Late Night Bar Ambience)"
+GENERATOR_VERSION = "1"
+RECORD_SCHEMA_VERSION = 1
+OUTPUT_FORMATS = ("markdown", "ndjson", "json", "all")
+SEED_SCHEMES = ("v1", "v2")
+SEED_SCHEME = "v1"
+PHRASE_SOURCES = ("pool", "grammar")
+PHRASE_SOURCE = "pool"
+SEO_STRENGTH = 3.0
+STRICT_TRACKLISTS = False
+TITLE_WINDOW = 2048
+TITLE_MAX_WORDS = 6
+TITLES_PER_PACKAGE = 3
+TRACKLINE_WINDOW = 96
+MAX_VARIANTS = 26
+MANIFEST_NAME = ".manifest.json"
+PACKAGE_LAYOUT = Path(__file__).resolve().parent.parent / "prompts" / "package-layout.md"
+
+PRIMARY_OBJECTS = CatalogPool("primary_objects")
+KEYWORD_POOL = CatalogPool("keyword_pool")
+MELANCHOLIC_PHRASES = CatalogPool("melancholic_phrases")
+NARRATIVE_LINES = CatalogPool("narrative_lines")
+OVERHEARD_QUOTES = CatalogPool("overheard_quotes")
+SEO_CONTEXT = CatalogPool("seo_context")
+ABOUT_NAD_LINES = CatalogPool("about_nad_lines")
+OPTIONAL_LATE_LINES = CatalogPool("optional_late_lines")
+TAG_POOL = CatalogPool("tag_pool")
+CHAPTER_MOMENTS = CatalogPool("chapter_moments")
+SUNO_TRACKLINE_POOL = CatalogPool("suno_trackline_pool")
+THUMBNAIL_VARIANTS = CatalogPool("thumbnail_variants")
+GRAMMAR_TEMPLATES = CatalogPool("grammar_templates")
+GRAMMAR_SUBJECTS = CatalogPool("grammar_subjects")
+GRAMMAR_VERBS = CatalogPool("grammar_verbs")
+GRAMMAR_MODIFIERS = CatalogPool("grammar_modifiers")
+GRAMMAR_MOODS = CatalogPool("grammar_moods")
+POOL_GLOBALS = {
+    "primary_objects": "PRIMARY_OBJECTS",
+    "keyword_pool": "KEYWORD_POOL",
+    "melancholic_phrases": "MELANCHOLIC_PHRASES",
+    "narrative_lines": "NARRATIVE_LINES",
+    "overheard_quotes": "OVERHEARD_QUOTES",
+    "seo_context": "SEO_CONTEXT",
+    "about_nad_lines": "ABOUT_NAD_LINES",
+    "optional_late_lines": "OPTIONAL_LATE_LINES",
+    "tag_pool": "TAG_POOL",
+    "chapter_moments": "CHAPTER_MOMENTS",
+    "suno_trackline_pool": "SUNO_TRACKLINE_POOL",
+    "thumbnail_variants": "THUMBNAIL_VARIANTS",
+    "grammar_templates": "GRAMMAR_TEMPLATES",
+    "grammar_subjects": "GRAMMAR_SUBJECTS",
+    "grammar_verbs": "GRAMMAR_VERBS",
+    "grammar_modifiers": "GRAMMAR_MODIFIERS",
+    "grammar_moods": "GRAMMAR_MOODS",
+}
+CHANNEL_KEYS = frozenset(
+    {
+        "name",
+        "series",
+        "publish_weekdays",
+        "cadence",
+        "anchor",
+        "blackouts",
+        "extra_dates",
+        "timezone",
+        "title_suffix",
+        "duration_seconds",
+        "pools_dir",
+        "layout",
+    }
+)
+
+STATS: RunStats | None = None
+SEO_CORPUS: SeoCorpus | None = None
+
+WORD_RE = re.compile(r"[a-z]+")
+ALNUM_RE = re.compile(r"[a-z0-9]+")
+CLOSE_VARIANT_THRESHOLD = 0.7
+STOPWORDS = frozenset({"the", "a", "and", "for", "in", "on", "of", "to", "we", "you", "i", "it", "at", "by", "our", "is"})
+TITLE_LINE_RE = re.compile(r"- \*\*[^*]+:\*\* (.+?) \| ")
+NUMBERED_LINE_RE = re.compile(r"\d+\. (.+)$")
+
+
+@lru_cache(maxsize=8)
+def local_tz(name: str = TZ_NAME) -> ZoneInfo:
+    from zoneinfo import ZoneInfo
+
+    return ZoneInfo(name)
+
+
+def __getattr__(name: str):
+    if name == "TZ":
+        return local_tz()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def enable_stats() -> RunStats:
+    from nad_stats import RunStats
+
+    global STATS
+    STATS = RunStats()
+    return STATS
+
+
+def profiled(fn):
+    name = fn.__name__
+
+    @wraps(fn)
+    def wrapper(*args, **kwargs):
+        if STATS is None:
+            return fn(*args, **kwargs)
+        with STATS.stage(name):
+            return fn(*args, **kwargs)
+
+    return wrapper
+
+
+def pool_sizes() -> dict[str, int]:
+    pools = {
+        "melancholic_phrases": MELANCHOLIC_PHRASES,
+        "narrative_lines": NARRATIVE_LINES,
+        "overheard_quotes": OVERHEARD_QUOTES,
+        "primary_objects": PRIMARY_OBJECTS,
+        "suno_trackline_pool": SUNO_TRACKLINE_POOL,
+        "tag_pool": TAG_POOL,
+    }
+    return {name: len(pool) for name, pool in pools.items()}
+
+
+@lru_cache(maxsize=64)
+def override_pool(pools_dir: Path, name: str) -> CatalogPool | None:
+    return CatalogPool(name, pools_dir) if (pools_dir / f"{name}.txt").exists() else None
+
+
+@dataclass(frozen=True)
+class Channel:
+    name: str = "nad"
+    series: tuple[str, ...] = SERIES
+    calendar: Calendar = Calendar(tuple(PUBLISH_WEEKDAYS))
+    tz_name: str = TZ_NAME
+    title_suffix: str = TITLE_SUFFIX
+    duration_seconds_range: tuple[int, int] = DURATION_SECONDS_RANGE
+    pools_dir: Path | None = None
+    layout: Path = PACKAGE_LAYOUT
+
+    def pool(self, name: str) -> Sequence[str]:
+        if self.pools_dir is not None:
+            found = override_pool(self.pools_dir, name)
+            if found is not None:
+                return found
+        return globals()[POOL_GLOBALS[name]]
+
+    def pool_hash(self) -> str:
+        digest = get_catalog().digest
+        if self.pools_dir is None:
+            return digest
+        return hashlib.sha256(f"{digest}|{get_catalog(self.pools_dir).digest}".encode("utf-8")).hexdigest()
+
+
+DEFAULT_CHANNEL = Channel()
+
+
+def load_channel(path: Path) -> Channel:
+    import json
+
+    raw = json.loads(path.read_text(encoding="utf-8"))
+    if not isinstance(raw, dict):
+        raise ValueError(f"{path}: channel config must be a JSON object")
+    unknown = set(raw) - CHANNEL_KEYS
+    if unknown:
+        raise ValueError(f"{path}: unknown channel keys: {', '.join(sorted(unknown))}")
+    series = tuple(raw.get("series", SERIES))
+    if not series:
+        raise ValueError(f"{path}: series must not be empty")
+    if "cadence" in raw and "publish_weekdays" in raw:
+        raise ValueError(f"{path}: cadence and publish_weekdays are mutually exclusive")
+    if "cadence" in raw:
+        try:
+            weekdays, interval = parse_rule(raw["cadence"])
+        except ValueError as exc:
+            raise ValueError(f"{path}: {exc}") from None
+    else:
+        labels = [label.upper() for label in raw.get("publish_weekdays", PUBLISH_WEEKDAYS.values())]
+        if not labels or any(label not in WEEKDAY_LABELS for label in labels):
+            raise ValueError(f"{path}: publish_weekdays must be a non-empty list of {', '.join(WEEKDAY_LABELS)}")
+        weekdays, interval = tuple(WEEKDAY_LABELS.index(label) for label in labels), 1
+    try:
+        calendar = Calendar(
+            weekdays,
+            interval=interval,
+            anchor=date.fromisoformat(raw["anchor"]) if "anchor" in raw else EPOCH,
+            blackouts=parse_dates(raw.get("blackouts", ())),
+            extras=parse_dates(raw.get("extra_dates", ())),
+        )
+    except ValueError as exc:
+        raise ValueError(f"{path}: {exc}") from None
+    low, high = raw.get("duration_seconds", DURATION_SECONDS_RANGE)
+    if not 0 < low <= high:
+        raise ValueError(f"{path}: duration_seconds must be [min, max] with 0 < min <= max")
+    tz_name = raw.get("timezone", TZ_NAME)
+    try:
+        local_tz(tz_name)
+    except (KeyError, ValueError):
+        raise ValueError(f"{path}: unknown timezone '{tz_name}'") from None
+    pools_dir = (path.parent / raw["pools_dir"]).resolve() if "pools_dir" in raw else None
+    if pools_dir is not None and not pools_dir.is_dir():
+        raise ValueError(f"{path}: pools_dir {pools_dir} is not a directory")
+    return Channel(
+        name=raw.get("name", path.stem),
+        series=series,
+        calendar=calendar,
+        tz_name=tz_name,
+        title_suffix=raw.get("title_suffix", TITLE_SUFFIX),
+        duration_seconds_range=(int(low), int(high)),
+        pools_dir=pools_dir,
+        layout=(path.parent / raw["layout"]).resolve() if "layout" in raw else PACKAGE_LAYOUT,
+    )
 
-SUNO_TRACKLINE_POOL = [
-    "Door Chime Under Soft Rain", "One More Glass For Silence", "Empty Stool By The Window", "Keep The Back Light Low",
-    "Whiskey Rings On Oak", "Last Call In A Whisper", "Your Coat Still Smells Rainy", "I Rinsed The Same Glass",
-    "No Rush We Are Closing", "Neon Reflections On Wet Wood", "A Quiet Pour For Two", "You Stayed Through The Slow Song",
-    "Rain Tapping The Bar Door", "Small Talk Under Dim Lights", "I Heard You Breathe Slowly", "Leave The Door Half Open",
-    "Glasses Drying In Blue Light", "You Asked For Less Noise", "Another Minute At The Counter", "Low Piano Behind The Bottle",
-    "We Let The Ice Melt", "The Mirror Held Your Silence", "Your Seat Stayed Warm Tonight", "I Counted Empty Stools",
-    "A Soft Pour Before Dawn", "You Looked Past The Neon", "Wood Smoke And Quiet Hands", "I Kept The Music Gentle",
-    "Last Orders In Rain", "No Questions Just Music", "The Window Caught Your Sigh", "You Said Keep It Low",
-    "Neon Drip On Glassware", "One Light Left Above", "I Saved The Corner Booth", "Our Voices Fell To Hush",
-    "A Napkin Folded Twice", "You Waited Out The Storm", "Slow Steps After Last Call", "The Bar Clock Felt Heavy",
-    "I Left Water Near", "A Quiet Booth For Two", "The Counter Knew Your Hands", "Rain Over Empty Alleys",
-    "No One Touched The Jukebox", "I Polished The Same Tumbler", "Blue Glow On Bottle Necks", "You Stayed Past Midnight",
-    "Soft Jazz Under Street Rain", "I Heard The Chime Twice", "One Last Song Before Close", "Warm Glass In Cold Hands",
-    "The Ashtray Filled Quietly", "You Watched The Streetlights Fade", "I Nodded And Poured", "The Room Breathed In Hush",
-    "Late Pour Near Closing Time", "A Chair Creak In Silence", "Under Neon We Spoke Less", "The Door Closed Gently",
-    "I Kept The Room Soft", "You Asked For The Usual", "A Gentle Bassline Stayed", "Fogged Glass Then Clear",
-    "Your Change Stayed Behind", "The Alley Stayed Blue", "A Quiet Rain Past Closing", "I Did Not Ask Why",
-    "You Left Before Sunrise", "One Empty Glass Remaining", "I Wiped The Counter Slow", "Low Lights Over Wet Wood",
-    "Behind The Bar I Waited", "You Said Nothing For Hours", "A Slow Pour And Pause", "The Night Leaned Inward",
-    "You Leaving Yet Tonight", "You Need The Window Seat", "You Want Another Quiet Pour", "Could We Keep It Soft",
-]
 
-THUMBNAIL_VARIANTS = [
-    "Faceless bartender hands polishing a glass over a worn wood bar top, lonely empty stool in frame, soft neon reflections, light smoke haze, cinematic grain, melancholic mood, quiet rain outside, 16:9 YouTube thumbnail composition, no text, no visible face, no logos.",
-    "Close detail of bar counter with whiskey glass, ring marks, and folded napkin, blurred faceless bartender in background, magenta-blue neon reflections, soft smoke haze, lonely late-night atmosphere, cinematic grain, 16:9 YouTube thumbnail composition, no text, no visible face, no logos.",
-    "Faceless bartender silhouette behind bottles and glassware, empty stools, rainy window reflections, gentle neon glow, subtle smoke haze, melancholic late-night bar ambience, cinematic grain, 16:9 YouTube thumbnail composition, no text, no visible face, no logos.",
-]
+def load_channels(paths: Iterable[Path]) -> list[Channel]:
+    channels: list[Channel] = []
+    for path in paths:
+        channel = load_channel(path)
+        if any(other.name == channel.name for other in channels):
+            raise ValueError(f"{path}: duplicate channel name '{channel.name}'")
+        channels.append(channel)
+    return channels
 
 
 @dataclass
@@ -159,6 +267,8 @@ class PackageContext:
     series: str
     keyword: str
     duration_target: str
+    channel: Channel = DEFAULT_CHANNEL
+    variant: int = 0
 
 
 @dataclass
@@ -166,31 +276,265 @@ class WeekArtifacts:
     phrase_map: dict[str, list[str]]
     tracklist_map: dict[str, list[str]]
     story_map: dict[str, str]
+    object_map: dict[str, str] = field(default_factory=dict)
+
+
+@dataclass
+class WeekShared:
+    object_map: dict[str, str]
+    story_pool: list[str]
+    track_pools: dict[str, list[str]]
+    sibling_lines: dict[str, set[str]] = field(default_factory=dict)
 
 
 def parse_args() -> argparse.Namespace:
+    import argparse
+
     parser = argparse.ArgumentParser(description="Generate weekly publishing packages for Notes After Dark")
     parser.add_argument("--base-date", help="Base date in YYYY-MM-DD (simulates now in America/Chihuahua).")
     parser.add_argument("--output-dir", default="nad-agent/packages", help="Output directory for markdown files.")
-    return parser.parse_args()
+    parser.add_argument("--weeks", type=int, help="Number of consecutive weeks to generate from the base date.")
+    parser.add_argument("--from", dest="from_date", help="Horizon start in YYYY-MM-DD (same meaning as --base-date).")
+    parser.add_argument("--to", dest="to_date", help="Horizon end in YYYY-MM-DD; whole weeks starting on or before it.")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1, help="Worker processes for multi-week runs.")
+    parser.add_argument(
+        "--unique-titles",
+        action="store_true",
+        help="Do not repeat title phrases across weeks until the phrase pool is exhausted.",
+    )
+    parser.add_argument(
+        "--archive",
+        help="Stream all packages into one .zip, .tar, .tar.gz or concatenated markdown file instead of --output-dir.",
+    )
+    parser.add_argument(
+        "--format",
+        choices=OUTPUT_FORMATS,
+        default="markdown",
+        help="markdown files, one structured record per package as NDJSON or a JSON document, or markdown plus NDJSON.",
+    )
+    parser.add_argument("--records", default="-", help="Where --format ndjson/json/all records go ('-' for stdout).")
+    parser.add_argument(
+        "--validate",
+        action="store_true",
+        help="Check every package against the template rules before writing; abort on violations.",
+    )
+    parser.add_argument(
+        "--incremental",
+        action="store_true",
+        help="Reuse sections whose pools did not change since the last run in --output-dir and report what changed.",
+    )
+    parser.add_argument(
+        "--variants",
+        type=int,
+        default=1,
+        help="Alternative packages per slot for A/B tests; variant b, c, ... files get a _b, _c suffix.",
+    )
+    parser.add_argument("--profile", action="store_true", help="Print per-stage timings and selection counters to stderr.")
+    parser.add_argument("--stats-json", help="Write per-stage timings and selection counters as JSON to this path.")
+    parser.add_argument("--ledger", help="SQLite usage ledger that records every emitted concept across runs.")
+    parser.add_argument(
+        "--avoid-weeks",
+        type=int,
+        default=8,
+        help="With --ledger, avoid concepts used in this many weeks before each generated week.",
+    )
+    parser.add_argument(
+        "--bootstrap-ledger",
+        action="store_true",
+        help="With --ledger, import existing package markdown from the output directory before generating.",
+    )
+    parser.add_argument(
+        "--phrase-source",
+        choices=PHRASE_SOURCES,
+        default="pool",
+        help="Draw titles and track lines from the fixed pools or from the template grammar.",
+    )
+    parser.add_argument(
+        "--seo-corpus",
+        help="Keyword CSV export (or a directory of them) used to favour high-scoring keywords, titles and tags.",
+    )
+    parser.add_argument(
+        "--seo-strength",
+        type=float,
+        default=SEO_STRENGTH,
+        help="With --seo-corpus, how much more likely the top scorer is than an unscored candidate, minus one.",
+    )
+    parser.add_argument(
+        "--channel",
+        dest="channel_files",
+        action="append",
+        default=[],
+        help="Channel config JSON (repeatable). Each channel is written to <output-dir>/<name>/.",
+    )
+    parser.add_argument(
+        "--seed-scheme",
+        choices=SEED_SCHEMES,
+        default="v1",
+        help="Seed derivation: v1 reproduces historical output; v2 uses cheap per-week counter streams.",
+    )
+    args = parser.parse_args()
+    if args.from_date and args.base_date:
+        parser.error("--from and --base-date are mutually exclusive")
+    if args.weeks is not None and args.to_date:
+        parser.error("--weeks and --to are mutually exclusive")
+    if args.weeks is not None and args.weeks < 1:
+        parser.error("--weeks must be at least 1")
+    if args.workers < 1:
+        parser.error("--workers must be at least 1")
+    if args.ledger and args.unique_titles:
+        parser.error("--ledger and --unique-titles are mutually exclusive")
+    if args.avoid_weeks < 0:
+        parser.error("--avoid-weeks must not be negative")
+    if args.bootstrap_ledger and not args.ledger:
+        parser.error("--bootstrap-ledger requires --ledger")
+    if args.archive and args.format in ("ndjson", "json"):
+        parser.error(f"--archive needs markdown output, not --format {args.format}")
+    if args.records != "-" and args.format == "markdown":
+        parser.error("--records requires --format ndjson, json or all")
+    if args.incremental and (args.archive or args.ledger or args.unique_titles or args.channel_files):
+        parser.error("--incremental cannot be combined with --archive, --ledger, --unique-titles or --channel")
+    if args.incremental and args.format != "markdown":
+        parser.error("--incremental only supports --format markdown")
+    if args.channel_files and args.ledger:
+        parser.error("--channel and --ledger are mutually exclusive")
+    if not 1 <= args.variants <= MAX_VARIANTS:
+        parser.error(f"--variants must be between 1 and {MAX_VARIANTS}")
+    if args.variants > 1 and (args.ledger or args.incremental):
+        parser.error("--variants cannot be combined with --ledger or --incremental")
+    if args.seo_strength < 0:
+        parser.error("--seo-strength must not be negative")
+    try:
+        start = args.from_date or args.base_date
+        if args.to_date and date.fromisoformat(args.to_date) < date.fromisoformat(start or args.to_date):
+            parser.error(f"--to {args.to_date} is earlier than the start date {start}")
+        args.channels = load_channels(Path(path) for path in args.channel_files)
+        if args.seo_corpus:
+            from nad_seo import load_corpus
+
+            load_corpus(Path(args.seo_corpus))
+    except (OSError, ValueError) as exc:
+        parser.error(str(exc))
+    return args
 
 
 def seed_from(*parts: str) -> int:
+    if STATS is not None:
+        STATS.incr("rng.instantiations")
     digest = hashlib.sha256("|".join(parts).encode("utf-8")).hexdigest()
     return int(digest[:16], 16)
 
 
-def get_base_date(raw: str | None) -> date:
-    return date.fromisoformat(raw) if raw else datetime.now(TZ).date()
+def set_seed_scheme(scheme: str) -> None:
+    global SEED_SCHEME
+    if scheme not in SEED_SCHEMES:
+        raise ValueError(f"Unknown seed scheme '{scheme}'")
+    SEED_SCHEME = scheme
+
+
+def set_phrase_source(source: str) -> None:
+    global PHRASE_SOURCE
+    if source not in PHRASE_SOURCES:
+        raise ValueError(f"Unknown phrase source '{source}'")
+    PHRASE_SOURCE = source
+
+
+def set_seo_corpus(path: str | None, strength: float = SEO_STRENGTH, snapshot: str | None = None) -> None:
+    global SEO_CORPUS, SEO_STRENGTH
+    if path is None:
+        SEO_CORPUS = None
+        return
+    from nad_seo import load_corpus
+
+    corpus = load_corpus(Path(path))
+    if snapshot is not None and corpus.digest[:16] != snapshot:
+        raise RuntimeError(f"SEO corpus {path} changed during the run")
+    SEO_CORPUS, SEO_STRENGTH = corpus, strength
+
+
+def set_strict_tracklists(strict: bool) -> None:
+    global STRICT_TRACKLISTS
+    STRICT_TRACKLISTS = strict
+
+
+def generation_settings() -> dict[str, str]:
+    settings = {"seed_scheme": SEED_SCHEME, "phrase_source": PHRASE_SOURCE}
+    if STRICT_TRACKLISTS:
+        settings["strict_tracklists"] = "1"
+    if SEO_CORPUS is not None:
+        settings.update(
+            seo_corpus=SEO_CORPUS.source,
+            seo_snapshot=SEO_CORPUS.digest[:16],
+            seo_strength=repr(SEO_STRENGTH),
+        )
+    return settings
+
+
+def apply_generation_settings(settings: dict[str, str]) -> None:
+    set_seed_scheme(settings["seed_scheme"])
+    set_phrase_source(settings["phrase_source"])
+    set_strict_tracklists("strict_tracklists" in settings)
+    if "seo_corpus" in settings:
+        set_seo_corpus(settings["seo_corpus"], float(settings["seo_strength"]), settings["seo_snapshot"])
+    else:
+        set_seo_corpus(None)
+
+
+@lru_cache(maxsize=1024)
+def week_root(week_index: int) -> bytes:
+    if STATS is not None:
+        STATS.incr("rng.instantiations")
+    return root_key("week", str(week_index))
+
+
+def stream_rng(publish_date: date, label: str) -> random.Random:
+    if STATS is not None:
+        STATS.incr("rng.substreams")
+    week_index = (publish_date.toordinal() - 1) // 7
+    return StreamRandom(substream_key(week_root(week_index), label))
+
+
+def channel_label(label: str, channel: Channel) -> str:
+    return label if channel.name == DEFAULT_CHANNEL.name else f"{label}|{channel.name}"
+
+
+def package_rng(label: str, publish_date: date, series: str, channel: Channel = DEFAULT_CHANNEL) -> random.Random:
+    label = channel_label(label, channel)
+    if SEED_SCHEME == "v1":
+        return random.Random(seed_from(label, str(publish_date), series))
+    return stream_rng(publish_date, f"{label}|{publish_date}|{series}")
+
+
+def week_rng(label: str, contexts: list[PackageContext]) -> random.Random:
+    label = channel_label(label, contexts[0].channel)
+    dates = sorted(c.publish_date.isoformat() for c in contexts)
+    if SEED_SCHEME == "v1":
+        return random.Random(seed_from(label, *dates))
+    return stream_rng(date.fromisoformat(dates[0]), "|".join([label, *dates]))
+
+
+def variant_label(label: str, variant: int) -> str:
+    return label if variant == 0 else f"{label}|variant{variant}"
+
+
+def variant_order(items: list[str], rng: random.Random) -> list[str]:
+    size = len(items)
+    if size < 2:
+        return list(items)
+    step = rng.choice([k for k in range(1, size) if gcd(k, size) == 1])
+    offset = rng.randrange(size)
+    return [items[(offset + i * step) % size] for i in range(size)]
+
+
+def get_base_date(raw: str | None, channel: Channel = DEFAULT_CHANNEL) -> date:
+    return date.fromisoformat(raw) if raw else datetime.now(local_tz(channel.tz_name)).date()
 
 
 def normalize(text: str) -> str:
-    return " ".join(re.findall(r"[a-z0-9]+", text.lower()))
+    return " ".join(ALNUM_RE.findall(text.lower()))
 
 
 def phrase_tokens(text: str) -> set[str]:
-    stop = {"the", "a", "and", "for", "in", "on", "of", "to", "we", "you", "i", "it", "at", "by", "our", "is"}
-    return {w for w in re.findall(r"[a-z]+", text.lower()) if len(w) > 2 and w not in stop}
+    return {w for w in WORD_RE.findall(text.lower()) if len(w) > 2 and w not in STOPWORDS}
 
 
 def format_hms(seconds: int) -> str:
@@ -200,69 +544,196 @@ def format_hms(seconds: int) -> str:
     return f"{h}:{m:02d}:{s:02d}"
 
 
-def generate_duration_target(rng: random.Random) -> str:
-    sec = rng.randint(*DURATION_SECONDS_RANGE)
+def generate_duration_target(rng: random.Random, seconds_range: tuple[int, int] = DURATION_SECONDS_RANGE) -> str:
+    sec = rng.randint(*seconds_range)
     return format_hms(sec)
 
 
-def pick_series_for_run(first_publish_date: date, slot_index: int) -> str:
-    rotation_index = first_publish_date.isocalendar().week % len(SERIES)
-    return SERIES[(rotation_index + slot_index) % len(SERIES)]
+def pick_series_for_run(
+    first_publish_date: date,
+    slot_index: int,
+    series: Sequence[str] = SERIES,
+    run_slots: int = len(PUBLISH_WEEKDAYS),
+) -> str:
+    # Advance the rotation so a run never opens with the series that closed the previous one.
+    step = run_slots - 2 if run_slots >= 3 else run_slots
+    rotation_index = first_publish_date.isocalendar().week * step % len(series)
+    return series[(rotation_index + slot_index) % len(series)]
+
+
+def next_publish_dates(
+    now_date: date,
+    count: int | None = None,
+    channel: Channel = DEFAULT_CHANNEL,
+) -> list[tuple[date, str]]:
+    calendar = channel.calendar
+    return [(slot.date, slot.label) for slot in calendar.after(now_date, count or calendar.slots_per_week)]
 
 
-def next_publish_dates(now_date: date, count: int = 3) -> list[tuple[date, str]]:
-    dates: list[tuple[date, str]] = []
-    cursor = now_date + timedelta(days=1)
-    while len(dates) < count:
-        if cursor.weekday() in PUBLISH_WEEKDAYS:
-            dates.append((cursor, PUBLISH_WEEKDAYS[cursor.weekday()]))
-        cursor += timedelta(days=1)
-    return dates
+def run_bases(calendar: Calendar, first: int, stop: int) -> list[date]:
+    return [calendar.slot(k).date - timedelta(days=1) for k in range(first, stop, calendar.slots_per_week)]
 
 
-def build_contexts(base: date) -> list[PackageContext]:
-    upcoming = next_publish_dates(base, 3)
+def horizon_bases(base: date, weeks: int, channel: Channel = DEFAULT_CHANNEL) -> list[date]:
+    calendar = channel.calendar
+    first = calendar.index(base + timedelta(days=1))
+    return run_bases(calendar, first, first + calendar.slots_per_week * weeks)
+
+
+def horizon_bases_until(base: date, end: date, channel: Channel = DEFAULT_CHANNEL) -> list[date]:
+    calendar = channel.calendar
+    return run_bases(calendar, calendar.index(base + timedelta(days=1)), calendar.index(end + timedelta(days=1)))
+
+
+@profiled
+def build_contexts(base: date, channel: Channel = DEFAULT_CHANNEL) -> list[PackageContext]:
+    run_slots = channel.calendar.slots_per_week
+    upcoming = next_publish_dates(base, run_slots, channel)
     first_publish_date = upcoming[0][0]
     contexts: list[PackageContext] = []
     for idx, (publish_date, weekday_label) in enumerate(upcoming):
-        series = pick_series_for_run(first_publish_date, idx)
-        rng = random.Random(seed_from("ctx", str(publish_date), series))
+        series = pick_series_for_run(first_publish_date, idx, channel.series, run_slots)
+        rng = package_rng("ctx", publish_date, series, channel)
         contexts.append(
             PackageContext(
                 publish_date=publish_date,
                 weekday_label=weekday_label,
                 series=series,
-                keyword=rng.choice(KEYWORD_POOL),
-                duration_target=generate_duration_target(rng),
+                keyword=seo_choice(rng, channel.pool("keyword_pool")),
+                duration_target=generate_duration_target(rng, channel.duration_seconds_range),
+                channel=channel,
             )
         )
     return contexts
 
 
-def pick_week_phrases(contexts: list[PackageContext]) -> dict[str, list[str]]:
-    rng = random.Random(seed_from("phrases", *sorted(c.publish_date.isoformat() for c in contexts)))
-    chosen = rng.sample(MELANCHOLIC_PHRASES, k=9)
-    return {ctx.publish_date.isoformat(): chosen[i * 3 : i * 3 + 3] for i, ctx in enumerate(contexts)}
+def seo_choice(rng: random.Random, items: Sequence[str]) -> str:
+    if SEO_CORPUS is None:
+        return rng.choice(items)
+    return SEO_CORPUS.choice(rng, items, SEO_STRENGTH)
+
+
+def seo_sample(rng: random.Random, items: Sequence[str], k: int) -> list[str]:
+    if SEO_CORPUS is None:
+        return rng.sample(items, k=k)
+    return SEO_CORPUS.sample(rng, items, k, SEO_STRENGTH)
 
 
-def format_title(phrase: str) -> str:
-    return f"{phrase} | {TITLE_SUFFIX}"
+def seo_shuffled(rng: random.Random, items: Sequence[str]) -> list[str]:
+    if SEO_CORPUS is None:
+        shuffled = list(items)
+        rng.shuffle(shuffled)
+        return shuffled
+    return SEO_CORPUS.order(rng, items, SEO_STRENGTH)
+
+
+def prefer_fresh(items: list[str], recent: set[str] | None, prefix: str, key=lambda item: item) -> list[str]:
+    if not recent:
+        return items
+    fresh = [item for item in items if f"{prefix}:{key(item)}" not in recent]
+    stale = [item for item in items if f"{prefix}:{key(item)}" in recent]
+    return fresh + stale
+
+
+@lru_cache(maxsize=4)
+def phrase_grammar(channel: Channel = DEFAULT_CHANNEL) -> Grammar:
+    slots = {
+        "subject": tuple(channel.pool("grammar_subjects")),
+        "verb": tuple(channel.pool("grammar_verbs")),
+        "modifier": tuple(channel.pool("grammar_modifiers")),
+        "object": tuple(obj.title() for obj in channel.pool("primary_objects")),
+        "mood": tuple(channel.pool("grammar_moods")),
+    }
+    return Grammar(tuple(channel.pool("grammar_templates")), slots)
+
+
+def generated_lines(label: str, start: int, channel: Channel = DEFAULT_CHANNEL) -> Iterator[str]:
+    index = pool_index(channel)
+    for line in phrase_grammar(channel).stream(channel_label(label, channel), start):
+        features = index.lookup(line)
+        if not features.title_case or not 3 <= features.word_count <= 9:
+            if STATS is not None:
+                STATS.incr(f"grammar.{label}.rejected")
+            continue
+        yield line
+
+
+def generated_week_phrases(contexts: list[PackageContext], exclude: Container[str] | None = None) -> list[str]:
+    channel = contexts[0].channel
+    first_publish_date = min(c.publish_date for c in contexts)
+    chosen: list[str] = []
+    wanted = TITLES_PER_PACKAGE * len(contexts)
+    index = pool_index(channel)
+    stream = generated_lines("titles", first_publish_date.toordinal() // 7 * TITLE_WINDOW, channel)
+    for phrase in islice(stream, len(phrase_grammar(channel))):
+        if index.lookup(phrase).word_count > TITLE_MAX_WORDS:
+            continue
+        if exclude is not None and f"title:{normalize(phrase)}" in exclude:
+            continue
+        if any(close_variant(phrase, other) or close_variant(other, phrase) for other in chosen):
+            continue
+        chosen.append(phrase)
+        if len(chosen) == wanted:
+            return chosen
+    raise RuntimeError("phrase grammar is exhausted")
+
+
+@profiled
+def pick_week_phrases(contexts: list[PackageContext], exclude: Container[str] | None = None) -> dict[str, list[str]]:
+    size = TITLES_PER_PACKAGE
+    if PHRASE_SOURCE == "grammar":
+        chosen = generated_week_phrases(contexts, exclude)
+        return {ctx.publish_date.isoformat(): chosen[i * size : i * size + size] for i, ctx in enumerate(contexts)}
+    phrases = contexts[0].channel.pool("melancholic_phrases")
+    rng = week_rng(variant_label("phrases", contexts[0].variant), contexts)
+    wanted = size * len(contexts)
+    if not exclude:
+        chosen = seo_sample(rng, phrases, wanted)
+    else:
+        fresh = [p for p in phrases if f"title:{normalize(p)}" not in exclude]
+        stale = [p for p in phrases if f"title:{normalize(p)}" in exclude]
+        chosen = seo_sample(rng, fresh, min(wanted, len(fresh)))
+        chosen += seo_sample(rng, stale, wanted - len(chosen))
+    if STATS is not None:
+        STATS.use("melancholic_phrases", chosen)
+    return {ctx.publish_date.isoformat(): chosen[i * size : i * size + size] for i, ctx in enumerate(contexts)}
+
+
+def format_title(phrase: str, suffix: str = TITLE_SUFFIX) -> str:
+    return f"{phrase} | {suffix}"
 
 
 def stem(line: str) -> str:
-    words = re.findall(r"[a-z]+", line.lower())
+    words = WORD_RE.findall(line.lower())
     return " ".join(words[:6])
 
 
-def build_week_microstories(contexts: list[PackageContext], used_concepts: set[str]) -> dict[str, str]:
-    available = NARRATIVE_LINES[:]
-    rng = random.Random(seed_from("stories", *sorted(c.publish_date.isoformat() for c in contexts)))
-    rng.shuffle(available)
+def shuffled_story_pool(contexts: list[PackageContext]) -> list[str]:
+    available = contexts[0].channel.pool("narrative_lines")[:]
+    week_rng("stories", contexts).shuffle(available)
+    return available
+
+
+@profiled
+def build_week_microstories(
+    contexts: list[PackageContext],
+    used_concepts: set[str],
+    recent: set[str] | None = None,
+    story_pool: list[str] | None = None,
+) -> dict[str, str]:
+    channel = contexts[0].channel
+    narrative_pool = channel.pool("narrative_lines")
+    available = shuffled_story_pool(contexts) if story_pool is None else story_pool
+    if contexts[0].variant:
+        available = variant_order(available, week_rng(variant_label("stories", contexts[0].variant), contexts))
     cursor = 0
+    index = pool_index(channel)
+    available = prefer_fresh(available, recent, "stem", lambda line: index.get(line).stem)
     out: dict[str, str] = {}
+    stems_before = len(used_concepts)
 
     for ctx in contexts:
-        rr = random.Random(seed_from("story", str(ctx.publish_date), ctx.series))
+        rr = package_rng(variant_label("story", ctx.variant), ctx.publish_date, ctx.series, ctx.channel)
         total_lines = rr.randint(8, 12)
         quote_count = rr.randint(4, min(6, total_lines - 3))
         narrative_count = total_lines - quote_count
@@ -271,21 +742,28 @@ def build_week_microstories(contexts: list[PackageContext], used_concepts: set[s
         while len(narrative) < narrative_count and cursor < len(available):
             cand = available[cursor]
             cursor += 1
-            s = stem(cand)
+            s = index.get(cand).stem
             if f"stem:{s}" in used_concepts:
+                if STATS is not None:
+                    STATS.incr("stories.rejected.stem_used")
                 continue
             used_concepts.add(f"stem:{s}")
             narrative.append(cand)
 
         if len(narrative) < narrative_count:
-            fallback = [n for n in NARRATIVE_LINES if f"stem:{stem(n)}" not in used_concepts]
+            if STATS is not None:
+                STATS.incr("stories.fallback")
+            fallback = [n for n in narrative_pool if f"stem:{index.get(n).stem}" not in used_concepts]
             for cand in fallback:
                 if len(narrative) >= narrative_count:
                     break
-                used_concepts.add(f"stem:{stem(cand)}")
+                used_concepts.add(f"stem:{index.get(cand).stem}")
                 narrative.append(cand)
 
-        quotes = rr.sample(OVERHEARD_QUOTES, k=quote_count)
+        quotes = rr.sample(channel.pool("overheard_quotes"), k=quote_count)
+        if STATS is not None:
+            STATS.use("narrative_lines", narrative)
+            STATS.use("overheard_quotes", quotes)
         lines: list[str] = [narrative[0]]
         ni, qi = 1, 0
         while ni < len(narrative) or qi < len(quotes):
@@ -298,49 +776,76 @@ def build_week_microstories(contexts: list[PackageContext], used_concepts: set[s
 
         out[ctx.publish_date.isoformat()] = "\n".join(lines[:total_lines])
 
+    if STATS is not None:
+        STATS.peak("week_consumed.narrative_lines", (len(used_concepts) - stems_before) / len(narrative_pool))
     return out
 
 
 def build_seo_paragraph(ctx: PackageContext) -> str:
-    rng = random.Random(seed_from("seo", str(ctx.publish_date), ctx.series))
+    rng = package_rng("seo", ctx.publish_date, ctx.series, ctx.channel)
     return (
         f"A mellow {ctx.keyword} set with noir jazz textures and late-night bar ambience, ideal for "
-        f"{rng.choice(SEO_CONTEXT)} when the city goes quiet."
+        f"{rng.choice(ctx.channel.pool('seo_context'))} when the city goes quiet."
     )
 
 
-def build_about_nad(ctx: PackageContext) -> str:
-    rng = random.Random(seed_from("about", str(ctx.publish_date), ctx.series))
-    lines = rng.sample(ABOUT_NAD_LINES, k=2)
+def pick_about_lines(ctx: PackageContext) -> list[str]:
+    about_lines = ctx.channel.pool("about_nad_lines")
+    rng = package_rng("about", ctx.publish_date, ctx.series, ctx.channel)
+    lines = rng.sample(about_lines, k=2)
     if rng.random() < 0.35:
-        lines.append(rng.choice([l for l in ABOUT_NAD_LINES if l not in lines]))
-    return "\n".join(lines)
+        lines.append(rng.choice([l for l in about_lines if l not in lines]))
+    return lines
+
+
+def build_about_nad(ctx: PackageContext) -> str:
+    return "\n".join(pick_about_lines(ctx))
+
+
+def pick_tag_list(ctx: PackageContext) -> list[str]:
+    rng = package_rng("tags", ctx.publish_date, ctx.series, ctx.channel)
+    tags = seo_shuffled(rng, ctx.channel.pool("tag_pool"))
+    picked = tags[: rng.randint(22, 30)]
+    if STATS is not None:
+        STATS.use("tag_pool", picked)
+    return picked
 
 
 def pick_tags(ctx: PackageContext) -> str:
-    rng = random.Random(seed_from("tags", str(ctx.publish_date), ctx.series))
-    tags = TAG_POOL[:]
-    rng.shuffle(tags)
-    return ", ".join(tags[: rng.randint(22, 30)])
+    return ", ".join(pick_tag_list(ctx))
 
 
-def build_chapters(duration_target: str) -> str:
+def chapter_marks(duration_target: str, moments: Sequence[str] = CHAPTER_MOMENTS) -> list[tuple[str, str]]:
     h, m, s = [int(x) for x in duration_target.split(":")]
     total_sec = h * 3600 + m * 60 + s
-    count = len(CHAPTER_MOMENTS)
+    count = len(moments)
     step = total_sec // (count - 1)
-    lines = []
-    for idx, label in enumerate(CHAPTER_MOMENTS):
+    marks = []
+    for idx, label in enumerate(moments):
         ts = idx * step
         mm, ss = divmod(ts, 60)
-        lines.append(f"- {mm:02d}:{ss:02d} {label}")
-    return "\n".join(lines)
+        marks.append((f"{mm:02d}:{ss:02d}", label))
+    return marks
+
+
+def build_chapters(duration_target: str, moments: Sequence[str] = CHAPTER_MOMENTS) -> str:
+    return "\n".join(f"- {ts} {label}" for ts, label in chapter_marks(duration_target, moments))
+
+
+def chapter_records(ctx: PackageContext) -> list[dict[str, str]]:
+    moments = ctx.channel.pool("chapter_moments")
+    return [{"time": ts, "label": label} for ts, label in chapter_marks(ctx.duration_target, moments)]
+
 
+def pick_late_line(ctx: PackageContext) -> str:
+    rng = package_rng("optional", ctx.publish_date, ctx.series, ctx.channel)
+    return rng.choice(ctx.channel.pool("optional_late_lines"))
 
-def get_main_object(line: str) -> str | None:
-    words = re.findall(r"[a-z]+", line.lower())
+
+def get_main_object(line: str, objects: Container[str] = PRIMARY_OBJECTS) -> str | None:
+    words = WORD_RE.findall(line.lower())
     for w in words:
-        if w in PRIMARY_OBJECTS:
+        if w in objects:
             return w
     return None
 
@@ -353,14 +858,149 @@ def close_variant(line: str, title_phrase: str) -> bool:
     if phrase_toks.issubset(line_tokens):
         return True
     overlap = len(line_tokens & phrase_toks) / len(phrase_toks)
-    return overlap >= 0.7
+    return overlap >= CLOSE_VARIANT_THRESHOLD
+
+
+def min_shared_tokens(phrase_size: int) -> int:
+    return next(shared for shared in range(1, phrase_size + 1) if shared / phrase_size >= CLOSE_VARIANT_THRESHOLD)
+
+
+@dataclass(frozen=True)
+class LineFeatures:
+    tokens: int
+    main_object: str | None
+    stem: str
+    word_count: int
+    title_case: bool
+
+
+TRANSIENT_FEATURES = 4096
+
+
+class TextIndex:
+    def __init__(self, track_pool: Sequence[str], objects: Container[str] = PRIMARY_OBJECTS) -> None:
+        self.objects = objects
+        self.vocab: dict[str, int] = {}
+        self.features: dict[str, LineFeatures] = {}
+        self.transient: dict[str, LineFeatures] = {}
+        self.track_positions: dict[str, int] = {}
+        self.close_rows: dict[str, int] = {}
+        self.postings: dict[int, int] = {}
+        for pos, line in enumerate(track_pool):
+            self.track_positions.setdefault(line, pos)
+        for line, pos in self.track_positions.items():
+            tokens = self.get(line).tokens
+            while tokens:
+                low = tokens & -tokens
+                self.postings[low] = self.postings.get(low, 0) | 1 << pos
+                tokens ^= low
+        self.track_pool = track_pool
+
+    def token_bits(self, text: str) -> int:
+        bits = 0
+        for token in phrase_tokens(text):
+            bit = self.vocab.setdefault(token, len(self.vocab))
+            bits |= 1 << bit
+        return bits
+
+    def describe(self, text: str) -> LineFeatures:
+        return LineFeatures(
+            tokens=self.token_bits(text),
+            main_object=get_main_object(text, self.objects),
+            stem=stem(text),
+            word_count=len(text.split()),
+            title_case=text == text.title(),
+        )
 
+    def get(self, text: str) -> LineFeatures:
+        found = self.features.get(text)
+        if found is None:
+            found = self.features[text] = self.describe(text)
+        return found
+
+    def lookup(self, text: str) -> LineFeatures:
+        found = self.features.get(text)
+        if found is None:
+            found = self.transient.get(text)
+        if found is None:
+            if len(self.transient) >= TRANSIENT_FEATURES:
+                self.transient.clear()
+            found = self.transient[text] = self.describe(text)
+        return found
+
+    def close_variant(self, line: str, title_phrase: str) -> bool:
+        return self.close_to_any(self.lookup(line).tokens, [self.lookup(title_phrase).tokens])
+
+    def close_to_any(self, line_bits: int, phrase_bits: Iterable[int]) -> bool:
+        for bits in phrase_bits:
+            if not bits:
+                continue
+            shared = line_bits & bits
+            if shared == bits or shared.bit_count() / bits.bit_count() >= CLOSE_VARIANT_THRESHOLD:
+                return True
+        return False
 
-def choose_primary_objects(contexts: list[PackageContext], used_concepts: set[str]) -> dict[str, str]:
-    rng = random.Random(seed_from("objects", *sorted(c.publish_date.isoformat() for c in contexts)))
-    objects = PRIMARY_OBJECTS[:]
+    def close_row(self, title_phrase: str) -> int:
+        row = self.close_rows.get(title_phrase)
+        if row is None:
+            row = 0
+            tokens = self.get(title_phrase).tokens
+            postings = []
+            while tokens:
+                low = tokens & -tokens
+                postings.append(self.postings.get(low, 0))
+                tokens ^= low
+            if postings:
+                for combo in combinations(postings, min_shared_tokens(len(postings))):
+                    row |= reduce(and_, combo)
+            self.close_rows[title_phrase] = row
+        return row
+
+    def close_mask(self, title_phrases: set[str]) -> int:
+        mask = 0
+        for phrase in title_phrases:
+            mask |= self.close_row(phrase)
+        return mask
+
+    def is_close(self, line: str, mask: int, title_phrases: set[str]) -> bool:
+        pos = self.track_positions.get(line)
+        if pos is not None:
+            return bool(mask >> pos & 1)
+        return self.close_to_any(self.lookup(line).tokens, (self.lookup(phrase).tokens for phrase in title_phrases))
+
+
+@lru_cache(maxsize=4)
+def _build_pool_index(
+    track_pool: Sequence[str],
+    objects: Sequence[str],
+    warm: tuple[Sequence[str], ...],
+) -> TextIndex:
+    index = TextIndex(track_pool, objects)
+    for pool in (track_pool, *warm):
+        for line in pool:
+            index.get(line)
+    return index
+
+
+def pool_index(channel: Channel = DEFAULT_CHANNEL) -> TextIndex:
+    names = ("suno_trackline_pool", "primary_objects", "melancholic_phrases", "narrative_lines")
+    pools = [channel.pool(name) for name in names]
+    pools = [pool if isinstance(pool, CatalogPool) else tuple(pool) for pool in pools]
+    return _build_pool_index(pools[0], pools[1], tuple(pools[2:]))
+
+
+def choose_primary_objects(
+    contexts: list[PackageContext],
+    used_concepts: set[str],
+    recent: set[str] | None = None,
+) -> dict[str, str]:
+    rng = week_rng("objects", contexts)
+    objects = contexts[0].channel.pool("primary_objects")[:]
     rng.shuffle(objects)
+    objects = prefer_fresh(objects, recent, "object")
     picked = objects[: len(contexts)]
+    if STATS is not None:
+        STATS.use("primary_objects", picked)
     out = {}
     for ctx, obj in zip(contexts, picked):
         out[ctx.publish_date.isoformat()] = obj
@@ -368,6 +1008,35 @@ def choose_primary_objects(contexts: list[PackageContext], used_concepts: set[st
     return out
 
 
+@dataclass(frozen=True)
+class TrackRules:
+    lock_objects: bool = True
+    avoid_titles: bool = True
+    shape_quotas: bool = True
+    week_unique: bool = True
+
+
+TRACKLIST_SIZE = 18
+MAX_SOLVER_ROUNDS = 4
+TRACKLIST_RELAXATIONS = [
+    TrackRules(),
+    TrackRules(lock_objects=False),
+    TrackRules(lock_objects=False, avoid_titles=False),
+    TrackRules(lock_objects=False, avoid_titles=False, shape_quotas=False),
+    TrackRules(lock_objects=False, avoid_titles=False, shape_quotas=False, week_unique=False),
+]
+RELAXATION_LABELS = {
+    "lock_objects": "primary-object lock",
+    "avoid_titles": "close-variant avoidance",
+    "shape_quotas": "shape quotas",
+    "week_unique": "week uniqueness",
+}
+
+
+class ValidationError(RuntimeError):
+    pass
+
+
 def build_tracklist_for_package(
     ctx: PackageContext,
     primary_object: str,
@@ -375,96 +1044,151 @@ def build_tracklist_for_package(
     used_lines_global: set[str],
     all_primary_objects: set[str],
 ) -> list[str]:
-    rng = random.Random(seed_from("tracklist", str(ctx.publish_date), ctx.series))
-    pool = SUNO_TRACKLINE_POOL[:]
-    rng.shuffle(pool)
+    candidates = tracklist_candidates(ctx, primary_object, title_phrases, all_primary_objects)
+    selected = select_tracklist([line for line in candidates if line not in used_lines_global])
+    if selected is None:
+        raise RuntimeError(f"Could not build {TRACKLIST_SIZE} track lines for {ctx.publish_date}")
+    return selected
+
+
+def starts_with_you_or_question(line: str) -> bool:
+    return line.startswith("You ") or line.endswith("?")
+
 
+def shuffled_track_pool(ctx: PackageContext) -> list[str]:
+    if PHRASE_SOURCE == "grammar":
+        lines = generated_lines("tracklines", ctx.publish_date.toordinal() * TRACKLINE_WINDOW, ctx.channel)
+        return list(islice(lines, TRACKLINE_WINDOW))
+    pool = ctx.channel.pool("suno_trackline_pool")[:]
+    package_rng("tracklist", ctx.publish_date, ctx.series, ctx.channel).shuffle(pool)
+    return pool
+
+
+def tracklist_candidates(
+    ctx: PackageContext,
+    primary_object: str,
+    title_phrases: set[str],
+    all_primary_objects: set[str],
+    rules: TrackRules = TrackRules(),
+    track_pool: list[str] | None = None,
+) -> list[str]:
+    index = pool_index(ctx.channel)
+    pool = shuffled_track_pool(ctx) if track_pool is None else track_pool
+    if ctx.variant:
+        rng = package_rng(variant_label("tracklist", ctx.variant), ctx.publish_date, ctx.series, ctx.channel)
+        pool = variant_order(pool, rng)
+    close_mask = index.close_mask(title_phrases) if rules.avoid_titles and PHRASE_SOURCE == "pool" else 0
+    stats = STATS
     candidates: list[str] = []
     for cand in pool:
-        if cand in used_lines_global:
-            continue
-        if not (3 <= len(cand.split()) <= 9):
+        features = index.lookup(cand)
+        if not (3 <= features.word_count <= 9):
+            if stats is not None:
+                stats.incr("tracklist.rejected.word_count")
             continue
-        if cand != cand.title():
+        if not features.title_case:
+            if stats is not None:
+                stats.incr("tracklist.rejected.title_case")
             continue
-        if any(close_variant(cand, phrase) for phrase in title_phrases):
+        if rules.avoid_titles and index.is_close(cand, close_mask, title_phrases):
+            if stats is not None:
+                stats.incr("tracklist.rejected.close_variant")
             continue
 
-        main_obj = get_main_object(cand)
-        if main_obj in all_primary_objects and main_obj != primary_object:
+        main_obj = features.main_object
+        if rules.lock_objects and main_obj in all_primary_objects and main_obj != primary_object:
+            if stats is not None:
+                stats.incr("tracklist.rejected.foreign_object")
             continue
         candidates.append(cand)
+    return candidates
+
 
+def select_tracklist(ordered: list[str], shape_quotas: bool = True) -> list[str] | None:
     selected: list[str] = []
+    chosen: set[str] = set()
     i_starts = 0
     you_or_q = 0
 
-    def add_line(line: str) -> bool:
+    def add_line(line: str) -> None:
         nonlocal i_starts, you_or_q
-        if line in selected:
-            return False
+        if line in chosen:
+            return
         starts_i = line.startswith("I ")
-        starts_you_or_q = line.startswith("You ") or line.endswith("?")
-        if starts_i and i_starts >= 3:
-            return False
+        if shape_quotas and starts_i and i_starts >= 3:
+            return
         selected.append(line)
+        chosen.add(line)
         if starts_i:
             i_starts += 1
-        if starts_you_or_q:
+        if starts_with_you_or_question(line):
             you_or_q += 1
-        return True
 
-    for cand in candidates:
-        if (cand.startswith("You ") or cand.endswith("?")) and you_or_q < 3:
-            add_line(cand)
-        if you_or_q >= 3:
-            break
+    if shape_quotas:
+        for cand in ordered:
+            if you_or_q >= 3:
+                break
+            if starts_with_you_or_question(cand):
+                add_line(cand)
 
-    for cand in candidates:
-        if len(selected) >= 18:
+    for cand in ordered:
+        if len(selected) >= TRACKLIST_SIZE:
             break
         add_line(cand)
 
-    if len(selected) < 18:
-        for cand in pool:
-            if len(selected) >= 18:
-                break
-            if cand in used_lines_global or cand in selected:
-                continue
-            if not (3 <= len(cand.split()) <= 9):
-                continue
-            if cand.startswith("I ") and i_starts >= 3:
-                continue
-            add_line(cand)
-
-    if you_or_q < 3:
-        for idx, line in enumerate(list(selected)):
-            if you_or_q >= 3:
-                break
-            if line.startswith("You ") or line.endswith("?"):
-                continue
-            for cand in candidates:
-                if cand in selected:
-                    continue
-                if not (cand.startswith("You ") or cand.endswith("?")):
-                    continue
-                selected[idx] = cand
-                you_or_q += 1
-                break
+    if len(selected) < TRACKLIST_SIZE or (shape_quotas and you_or_q < 3):
+        return None
+    return selected
 
-    if len(selected) != 18:
-        raise RuntimeError(f"Could not build 18 track lines for {ctx.publish_date}")
 
-    used_lines_global.update(selected)
-    return selected
+def solve_tracklists(
+    keys: list[str],
+    candidates: dict[str, list[str]],
+    rules: TrackRules,
+) -> dict[str, list[str]] | None:
+    reserved: dict[str, str] = {}
+    for _ in range(MAX_SOLVER_ROUNDS):
+        if STATS is not None:
+            STATS.incr("tracklist.solver_rounds")
+        taken: set[str] = set()
+        out: dict[str, list[str]] = {}
+        failed: str | None = None
+        for key in keys:
+            own = [c for c in candidates[key] if reserved.get(c, key) == key]
+            others = [c for c in candidates[key] if reserved.get(c, key) != key]
+            ordered = own + others
+            if rules.week_unique:
+                if STATS is not None:
+                    STATS.incr("tracklist.rejected.used_globally", sum(c in taken for c in ordered))
+                ordered = [c for c in ordered if c not in taken]
+            selected = select_tracklist(ordered, rules.shape_quotas)
+            if selected is None:
+                failed = key
+                break
+            out[key] = selected
+            taken.update(selected)
+        if failed is None:
+            return out
+
+        contested = {c: failed for c in candidates[failed] if c in taken and c not in reserved}
+        if not contested:
+            return None
+        reserved.update(contested)
+    return None
 
 
+@profiled
 def build_week_tracklists(
     contexts: list[PackageContext],
     phrase_map: dict[str, list[str]],
     used_concepts: set[str],
+    primary_obj_map: dict[str, str] | None = None,
+    recent: set[str] | None = None,
+    track_pools: dict[str, list[str]] | None = None,
+    siblings: dict[str, set[str]] | None = None,
 ) -> dict[str, list[str]]:
-    primary_obj_map = choose_primary_objects(contexts, used_concepts)
+    if primary_obj_map is None:
+        primary_obj_map = choose_primary_objects(contexts, used_concepts, recent)
     all_primary_objects = set(primary_obj_map.values())
 
     title_phrases: set[str] = set()
@@ -473,117 +1197,746 @@ def build_week_tracklists(
             title_phrases.add(phrase)
             used_concepts.add(f"title:{normalize(phrase)}")
 
-    used_lines_global: set[str] = set()
-    out: dict[str, list[str]] = {}
-    for ctx in contexts:
-        out[ctx.publish_date.isoformat()] = build_tracklist_for_package(
-            ctx,
-            primary_object=primary_obj_map[ctx.publish_date.isoformat()],
-            title_phrases=title_phrases,
-            used_lines_global=used_lines_global,
-            all_primary_objects=all_primary_objects,
-        )
-    return out
-
-
-def build_markdown(ctx: PackageContext, phrases: list[str], story: str, tracklist: list[str]) -> str:
-    rng = random.Random(seed_from("optional", str(ctx.publish_date), ctx.series))
-    titles = [format_title(p) for p in phrases]
-    numbered_tracks = "\n".join(f"{i + 1}. {line}" for i, line in enumerate(tracklist))
-    thumbnail_variants = "\n".join(f"- Variant {i + 1}: {v}" for i, v in enumerate(THUMBNAIL_VARIANTS))
-
-    return f"""---
-date: {ctx.publish_date.isoformat()}
-weekday: {ctx.weekday_label}
-series: {ctx.series}
-keyword: {ctx.keyword}
-duration_target: {ctx.duration_target}
----
-
-# Titles
-- **Final title:** {titles[0]}
-- **Alternate 1:** {titles[1]}
-- **Alternate 2:** {titles[2]}
+    keys = [ctx.publish_date.isoformat() for ctx in contexts]
+    for level, rules in enumerate(TRACKLIST_RELAXATIONS):
+        candidates = {
+            ctx.publish_date.isoformat(): prefer_fresh(
+                tracklist_candidates(
+                    ctx,
+                    primary_object=primary_obj_map[ctx.publish_date.isoformat()],
+                    title_phrases=title_phrases,
+                    all_primary_objects=all_primary_objects,
+                    rules=rules,
+                    track_pool=track_pools[ctx.publish_date.isoformat()] if track_pools else None,
+                ),
+                recent,
+                "line",
+                normalize,
+            )
+            for ctx in contexts
+        }
+        solved = None
+        if siblings:
+            # Keep lines other variants used on the same slot out while the pool allows it.
+            distinct = {
+                key: [line for line in lines if normalize(line) not in siblings.get(key, ())]
+                for key, lines in candidates.items()
+            }
+            solved = solve_tracklists(keys, distinct, rules)
+        if solved is None:
+            solved = solve_tracklists(keys, candidates, rules)
+        if solved is not None:
+            if level:
+                dropped = ", ".join(label for name, label in RELAXATION_LABELS.items() if not getattr(rules, name))
+                message = f"week of {contexts[0].publish_date}: tracklist relaxation level {level} dropped {dropped}"
+                if STRICT_TRACKLISTS:
+                    raise ValidationError(message)
+                import sys
+
+                print(f"warning: {message}", file=sys.stderr)
+            if STATS is not None:
+                STATS.incr(f"tracklist.relaxation_level.{level}")
+            if STATS is not None and PHRASE_SOURCE == "pool":
+                for selected in solved.values():
+                    STATS.use("suno_trackline_pool", selected)
+                week_lines = {line for selected in solved.values() for line in selected}
+                track_pool = contexts[0].channel.pool("suno_trackline_pool")
+                STATS.peak("week_consumed.suno_trackline_pool", len(week_lines) / len(track_pool))
+            return solved
+    raise RuntimeError(f"Could not build {TRACKLIST_SIZE} track lines for week of {contexts[0].publish_date}")
+
+
+class PackageRenderer:
+    FIELD = re.compile(r"\{([a-z0-9_]+)\}")
+
+    def __init__(self, layout: str, constants: dict[str, str]) -> None:
+        self.literals: list[str] = []
+        self.fields: list[str] = []
+        pending = ""
+        cursor = 0
+        for m in self.FIELD.finditer(layout):
+            pending += layout[cursor : m.start()]
+            cursor = m.end()
+            name = m.group(1)
+            if name in constants:
+                pending += constants[name]
+                continue
+            self.literals.append(pending)
+            self.fields.append(name)
+            pending = ""
+        self.literals.append(pending + layout[cursor:])
+
+    def render(self, values: dict[str, str]) -> str:
+        parts = [self.literals[0]]
+        for name, literal in zip(self.fields, self.literals[1:]):
+            parts.append(values[name])
+            parts.append(literal)
+        return "".join(parts)
+
+
+@lru_cache(maxsize=4)
+def package_renderer(channel: Channel = DEFAULT_CHANNEL) -> PackageRenderer:
+    variants = channel.pool("thumbnail_variants")
+    thumbnail_variants = "\n".join(f"- Variant {i + 1}: {v}" for i, v in enumerate(variants))
+    return PackageRenderer(
+        channel.layout.read_text(encoding="utf-8"),
+        constants={"thumbnail_variants": thumbnail_variants},
+    )
 
-# Description (YouTube)
-## Noir micro-story
-{story}
 
-## SEO paragraph
-{build_seo_paragraph(ctx)}
+def refresh_pools() -> bool:
+    if not refresh_catalogs():
+        return False
+    phrase_grammar.cache_clear()
+    _build_pool_index.cache_clear()
+    package_renderer.cache_clear()
+    return True
 
-## About NAD
-{build_about_nad(ctx)}
 
-## Optional late-hours line
-{rng.choice(OPTIONAL_LATE_LINES)}
+def build_record(
+    ctx: PackageContext,
+    phrases: list[str],
+    story: str,
+    tracklist: list[str],
+    primary_object: str | None = None,
+    sections: dict | None = None,
+) -> dict:
+    channel = ctx.channel
+    if sections is None:
+        sections = {
+            "seo_paragraph": build_seo_paragraph(ctx),
+            "about": pick_about_lines(ctx),
+            "late_line": pick_late_line(ctx),
+            "tags": pick_tag_list(ctx),
+            "chapters": chapter_records(ctx),
+        }
+    return {
+        "schema_version": RECORD_SCHEMA_VERSION,
+        "channel": channel.name,
+        "filename": package_filename(ctx),
+        "variant": variant_letter(ctx.variant),
+        "date": ctx.publish_date.isoformat(),
+        "weekday": ctx.weekday_label,
+        "series": ctx.series,
+        "keyword": ctx.keyword,
+        "duration_target": ctx.duration_target,
+        "titles": [format_title(p, channel.title_suffix) for p in phrases],
+        "phrases": list(phrases),
+        "story": story.split("\n"),
+        "seo_paragraph": sections["seo_paragraph"],
+        "about": sections["about"],
+        "late_line": sections["late_line"],
+        "tags": sections["tags"],
+        "chapters": sections["chapters"],
+        "tracklist": list(tracklist),
+        "primary_object": primary_object,
+    }
+
+
+def render_record(record: dict, channel: Channel = DEFAULT_CHANNEL) -> str:
+    titles = record["titles"]
+    return package_renderer(channel).render(
+        {
+            "date": record["date"],
+            "weekday": record["weekday"],
+            "series": record["series"],
+            "keyword": record["keyword"],
+            "duration_target": record["duration_target"],
+            "final_title": titles[0],
+            "alternate_1": titles[1],
+            "alternate_2": titles[2],
+            "story": "\n".join(record["story"]),
+            "seo_paragraph": record["seo_paragraph"],
+            "about_nad": "\n".join(record["about"]),
+            "late_line": record["late_line"],
+            "tags": ", ".join(record["tags"]),
+            "chapters": "\n".join(f"- {mark['time']} {mark['label']}" for mark in record["chapters"]),
+            "tracklist": "\n".join(f"{i + 1}. {line}" for i, line in enumerate(record["tracklist"])),
+        }
+    )
 
-# Tags (22–30)
-{pick_tags(ctx)}
 
-# Chapters (template)
-> Replace timestamps after final mix export.
+@profiled
+def build_markdown(ctx: PackageContext, phrases: list[str], story: str, tracklist: list[str]) -> str:
+    return render_record(build_record(ctx, phrases, story, tracklist), ctx.channel)
 
-{build_chapters(ctx.duration_target)}
 
-## Suno Tracklist (Song-Title Lines)
-Mood Arc: Warm Open → Quiet Confession → Last Call
+def slugify_series(series: str) -> str:
+    return series.lower().replace(" ", "-")
 
-{numbered_tracks}
 
-# Pinned comment
-I kept the lights low for this one. Where are you listening from tonight? 🌧️🥃
+def variant_letter(variant: int) -> str:
+    return chr(ord("a") + variant)
 
-# 3 engagement comments
-1. Which detail hits you harder tonight: the rain, the glassware, or the silence?
-2. Are you listening while reading, studying, or working late?
-3. What bar moment should open the next mix: door chime, empty stool, or last call?
 
-# Thumbnail prompts (NAD style)
-{thumbnail_variants}
-"""
+def package_filename(ctx: PackageContext) -> str:
+    variant = f"_{variant_letter(ctx.variant)}" if ctx.variant else ""
+    return f"{ctx.publish_date.isoformat()}_{ctx.weekday_label}_{slugify_series(ctx.series)}{variant}.md"
 
 
-def slugify_series(series: str) -> str:
-    return series.lower().replace(" ", "-")
+def build_week_shared(contexts: list[PackageContext]) -> WeekShared:
+    return WeekShared(
+        object_map=choose_primary_objects(contexts, set()),
+        story_pool=shuffled_story_pool(contexts),
+        track_pools={ctx.publish_date.isoformat(): shuffled_track_pool(ctx) for ctx in contexts},
+    )
 
 
-def build_week_artifacts(contexts: list[PackageContext]) -> WeekArtifacts:
+@profiled
+def build_week_artifacts(
+    contexts: list[PackageContext],
+    phrase_map: dict[str, list[str]] | None = None,
+    recent: set[str] | None = None,
+    shared: WeekShared | None = None,
+) -> WeekArtifacts:
     used_concepts: set[str] = set()
-    phrase_map = pick_week_phrases(contexts)
-    story_map = build_week_microstories(contexts, used_concepts)
-    tracklist_map = build_week_tracklists(contexts, phrase_map, used_concepts)
-    return WeekArtifacts(phrase_map=phrase_map, tracklist_map=tracklist_map, story_map=story_map)
+    if phrase_map is None:
+        phrase_map = pick_week_phrases(contexts, exclude=recent)
+    if shared is None:
+        story_map = build_week_microstories(contexts, used_concepts, recent)
+        object_map = choose_primary_objects(contexts, used_concepts, recent)
+        tracklist_map = build_week_tracklists(contexts, phrase_map, used_concepts, object_map, recent)
+    else:
+        story_map = build_week_microstories(contexts, used_concepts, recent, story_pool=shared.story_pool)
+        object_map = dict(shared.object_map)
+        used_concepts.update(f"object:{obj}" for obj in object_map.values())
+        tracklist_map = build_week_tracklists(
+            contexts,
+            phrase_map,
+            used_concepts,
+            object_map,
+            recent,
+            track_pools=shared.track_pools,
+            siblings=shared.sibling_lines,
+        )
+    return WeekArtifacts(
+        phrase_map=phrase_map,
+        tracklist_map=tracklist_map,
+        story_map=story_map,
+        object_map=object_map,
+    )
 
 
-def write_packages(contexts: list[PackageContext], output_dir: Path) -> list[Path]:
-    output_dir.mkdir(parents=True, exist_ok=True)
-    for old in output_dir.glob("*.md"):
-        old.unlink(missing_ok=True)
+def package_concepts(
+    phrases: list[str],
+    story: str,
+    tracklist: list[str],
+    primary_object: str | None = None,
+) -> set[str]:
+    concepts = {f"title:{normalize(p)}" for p in phrases}
+    concepts.update(f"stem:{stem(line)}" for line in story.splitlines() if line and not line.startswith('"'))
+    concepts.update(f"line:{normalize(line)}" for line in tracklist)
+    if primary_object:
+        concepts.add(f"object:{primary_object}")
+    return concepts
 
-    artifacts = build_week_artifacts(contexts)
-    written: list[Path] = []
+
+def record_week(ledger: UsageLedger, contexts: list[PackageContext], artifacts: WeekArtifacts) -> None:
     for ctx in contexts:
         date_key = ctx.publish_date.isoformat()
-        target = output_dir / f"{date_key}_{ctx.weekday_label}_{slugify_series(ctx.series)}.md"
-        target.write_text(
-            build_markdown(
-                ctx,
+        ledger.record(
+            package_filename(ctx).removesuffix(".md"),
+            ctx.publish_date,
+            package_concepts(
                 artifacts.phrase_map[date_key],
                 artifacts.story_map[date_key],
                 artifacts.tracklist_map[date_key],
+                artifacts.object_map.get(date_key),
             ),
-            encoding="utf-8",
         )
+
+
+def parse_package_markdown(text: str) -> tuple[date, list[str], str, list[str]] | None:
+    publish_date: date | None = None
+    phrases: list[str] = []
+    story: list[str] = []
+    tracklist: list[str] = []
+    section = ""
+    for line in text.splitlines():
+        if line.startswith("date: ") and publish_date is None:
+            publish_date = date.fromisoformat(line.removeprefix("date: ").strip())
+        elif line.startswith("#"):
+            section = line.lstrip("#").strip()
+        elif section == "Titles" and (m := TITLE_LINE_RE.match(line)):
+            phrases.append(m.group(1))
+        elif section == "Noir micro-story" and line.strip():
+            story.append(line)
+        elif section.startswith("Suno Tracklist") and (m := NUMBERED_LINE_RE.match(line)):
+            tracklist.append(m.group(1))
+    if publish_date is None:
+        return None
+    return publish_date, phrases, "\n".join(story), tracklist
+
+
+def bootstrap_ledger(ledger: UsageLedger, packages_dir: Path) -> int:
+    imported = 0
+    for path in sorted(packages_dir.glob("*.md")):
+        parsed = parse_package_markdown(path.read_text(encoding="utf-8"))
+        if parsed is None:
+            continue
+        publish_date, phrases, story, tracklist = parsed
+        ledger.record(path.stem, publish_date, package_concepts(phrases, story, tracklist))
+        imported += 1
+    return imported
+
+
+def plan_unique_phrases(weeks: list[list[PackageContext]]) -> list[dict[str, list[str]]]:
+    plans: list[dict[str, list[str]]] = []
+    if len({contexts[0].channel for contexts in weeks}) > 1:
+        for _, group in groupby(weeks, key=lambda contexts: contexts[0].channel):
+            plans.extend(plan_unique_phrases(list(group)))
+        return plans
+    if PHRASE_SOURCE == "grammar":
+        seen = BloomFilter(capacity=max(1024, TITLES_PER_PACKAGE * sum(map(len, weeks))))
+        for contexts in weeks:
+            phrase_map = pick_week_phrases(contexts, exclude=seen)
+            seen.update([f"title:{normalize(p)}" for phrases in phrase_map.values() for p in phrases])
+            plans.append(phrase_map)
+        return plans
+
+    phrases = weeks[0][0].channel.pool("melancholic_phrases") if weeks else MELANCHOLIC_PHRASES
+    used_titles: set[str] = set()
+    for contexts in weeks:
+        fresh = sum(f"title:{normalize(p)}" not in used_titles for p in phrases)
+        if fresh < TITLES_PER_PACKAGE * len(contexts):
+            used_titles.clear()
+        phrase_map = pick_week_phrases(contexts, exclude=used_titles)
+        used_titles.update(f"title:{normalize(p)}" for phrases in phrase_map.values() for p in phrases)
+        plans.append(phrase_map)
+    return plans
+
+
+def plan_variant_phrases(weeks: list[list[PackageContext]], variants: int) -> list[list[dict[str, list[str]]]]:
+    # Plan every week's variant a first so it matches a run without --variants, then b, c, ... on top.
+    plans: list[list[dict[str, list[str]]]] = []
+    for _, group in groupby(weeks, key=lambda contexts: contexts[0].channel):
+        group = list(group)
+        ordered = [[replace(ctx, variant=v) for ctx in contexts] for v in range(variants) for contexts in group]
+        flat = plan_unique_phrases(ordered)
+        plans.extend([flat[v * len(group) + w] for v in range(variants)] for w in range(len(group)))
+    return plans
+
+
+def render_week(
+    contexts: list[PackageContext],
+    phrase_map: dict[str, list[str]] | None = None,
+    records: bool = False,
+    variants: int = 1,
+    variant_phrases: list[dict[str, list[str]]] | None = None,
+) -> list[tuple]:
+    if variants > 1:
+        return render_variants(contexts, variant_phrases or [phrase_map], records, variants)
+    return render_artifacts(contexts, build_week_artifacts(contexts, phrase_map), records)
+
+
+def render_variants(
+    contexts: list[PackageContext],
+    phrase_maps: list[dict[str, list[str]] | None],
+    records: bool,
+    variants: int,
+) -> list[tuple]:
+    shared = build_week_shared(contexts)
+    used: set[str] = set()
+    rendered: list[tuple] = []
+    for variant in range(variants):
+        variant_contexts = [replace(ctx, variant=variant) for ctx in contexts] if variant else contexts
+        phrase_map = phrase_maps[variant] if variant < len(phrase_maps) else None
+        if phrase_map is None:
+            phrase_map = pick_week_phrases(variant_contexts, exclude=used)
+        artifacts = build_week_artifacts(variant_contexts, phrase_map, recent=used, shared=shared)
+        for ctx in contexts:
+            key = ctx.publish_date.isoformat()
+            tracklist = artifacts.tracklist_map[key]
+            used |= package_concepts(artifacts.phrase_map[key], artifacts.story_map[key], tracklist)
+            shared.sibling_lines.setdefault(key, set()).update(map(normalize, tracklist))
+        rendered.extend(render_artifacts(variant_contexts, artifacts, records))
+    return rendered
+
+
+def render_artifacts(contexts: list[PackageContext], artifacts: WeekArtifacts, records: bool = False) -> list[tuple]:
+    rendered: list[tuple] = []
+    for ctx in contexts:
+        date_key = ctx.publish_date.isoformat()
+        phrases = artifacts.phrase_map[date_key]
+        story = artifacts.story_map[date_key]
+        tracklist = artifacts.tracklist_map[date_key]
+        if not records:
+            rendered.append((package_filename(ctx), build_markdown(ctx, phrases, story, tracklist)))
+            continue
+        record = build_record(ctx, phrases, story, tracklist, artifacts.object_map.get(date_key))
+        rendered.append((package_filename(ctx), render_record(record, ctx.channel), record))
+    return rendered
+
+
+def _render_week_job(
+    job: tuple[list[PackageContext], list[dict[str, list[str]]] | None, bool, dict[str, str], bool, int],
+) -> tuple[list[tuple], dict | None]:
+    contexts, phrase_maps, collect_stats, settings, records, variants = job
+    apply_generation_settings(settings)
+    phrase_map = phrase_maps[0] if phrase_maps else None
+    if not collect_stats:
+        return render_week(contexts, phrase_map, records, variants, phrase_maps), None
+    stats = enable_stats()
+    rendered = render_week(contexts, phrase_map, records, variants, phrase_maps)
+    return rendered, stats.snapshot()
+
+
+def iter_horizon(
+    weeks: list[list[PackageContext]],
+    workers: int = 1,
+    unique_titles: bool = False,
+    ledger: UsageLedger | None = None,
+    avoid_weeks: int = 8,
+    records: bool = False,
+    variants: int = 1,
+) -> Iterator[list[tuple]]:
+    if ledger is not None:
+        for contexts in weeks:
+            artifacts = build_week_artifacts(contexts, recent=ledger.recent(contexts[0].publish_date, avoid_weeks))
+            record_week(ledger, contexts, artifacts)
+            yield render_artifacts(contexts, artifacts, records)
+        return
+
+    phrase_plans = plan_variant_phrases(weeks, variants) if unique_titles else [None] * len(weeks)
+    if workers <= 1 or len(weeks) <= 1:
+        for contexts, phrase_maps in zip(weeks, phrase_plans):
+            yield render_week(contexts, phrase_maps[0] if phrase_maps else None, records, variants, phrase_maps)
+        return
+    jobs = [
+        (contexts, phrase_maps, STATS is not None, generation_settings(), records, variants)
+        for contexts, phrase_maps in zip(weeks, phrase_plans)
+    ]
+    from concurrent.futures import ProcessPoolExecutor
+
+    chunksize = max(1, len(jobs) // (workers * 4))
+    with ProcessPoolExecutor(max_workers=min(workers, len(jobs))) as pool:
+        for rendered, snapshot in pool.map(_render_week_job, jobs, chunksize=chunksize):
+            if snapshot is not None and STATS is not None:
+                STATS.merge(snapshot)
+            yield rendered
+
+
+def render_horizon(
+    weeks: list[list[PackageContext]],
+    workers: int = 1,
+    unique_titles: bool = False,
+    ledger: UsageLedger | None = None,
+    avoid_weeks: int = 8,
+) -> list[list[tuple[str, str]]]:
+    return list(iter_horizon(weeks, workers, unique_titles, ledger, avoid_weeks))
+
+
+def write_horizon(
+    weeks: list[list[PackageContext]],
+    output_dir: Path,
+    workers: int = 1,
+    unique_titles: bool = False,
+    ledger: UsageLedger | None = None,
+    avoid_weeks: int = 8,
+    validate: bool = False,
+) -> list[Path]:
+    horizon = render_horizon(
+        weeks,
+        workers=workers,
+        unique_titles=unique_titles,
+        ledger=ledger,
+        avoid_weeks=avoid_weeks,
+    )
+    channel = weeks[0][0].channel if weeks else DEFAULT_CHANNEL
+    rendered = [item for week in horizon for item in week]
+    return write_rendered(rendered, output_dir, validate=validate, channel=channel)
+
+
+def content_hash(text: str) -> str:
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+def atomic_write_bytes(target: Path, data: bytes) -> None:
+    tmp = target.with_name(f".{target.name}.{os.getpid()}.tmp")
+    try:
+        tmp.write_bytes(data)
+        os.replace(tmp, target)
+    finally:
+        tmp.unlink(missing_ok=True)
+
+
+def load_manifest(output_dir: Path) -> dict:
+    import json
+
+    try:
+        manifest = json.loads((output_dir / MANIFEST_NAME).read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return {}
+    return manifest if isinstance(manifest, dict) else {}
+
+
+def unchanged_on_disk(target: Path, digest: str, entry: dict | None) -> bool:
+    try:
+        st = target.stat()
+    except FileNotFoundError:
+        return False
+    if entry and entry.get("sha256") == digest:
+        if entry.get("size") == st.st_size and entry.get("mtime_ns") == st.st_mtime_ns:
+            return True
+    return hashlib.sha256(target.read_bytes()).hexdigest() == digest
+
+
+@profiled
+def validate_rendered(rendered: list[tuple[str, str]], channel: Channel = DEFAULT_CHANNEL) -> None:
+    from nad_validate import validate_markdown
+
+    errors = [
+        violation
+        for filename, markdown in rendered
+        for violation in validate_markdown(markdown, filename, channel)
+        if violation.severity == "error"
+    ]
+    if errors:
+        first = errors[0]
+        raise ValidationError(f"{len(errors)} template violations, first in {first.file}: {first.message}")
+
+
+@profiled
+def write_rendered(
+    rendered: list[tuple[str, str]],
+    output_dir: Path,
+    validate: bool = False,
+    channel: Channel = DEFAULT_CHANNEL,
+) -> list[Path]:
+    if not rendered:
+        return []
+    if validate:
+        validate_rendered(rendered, channel)
+    output_dir.mkdir(parents=True, exist_ok=True)
+    previous = load_manifest(output_dir).get("packages", {})
+    packages: dict[str, dict] = {}
+    written: list[Path] = []
+    for filename, markdown in rendered:
+        target = output_dir / filename
+        digest = content_hash(markdown)
+        if not unchanged_on_disk(target, digest, previous.get(filename)):
+            atomic_write_bytes(target, markdown.encode("utf-8"))
+        st = target.stat()
+        packages[filename] = {"sha256": digest, "size": st.st_size, "mtime_ns": st.st_mtime_ns}
         written.append(target)
+
+    for old in output_dir.glob("*.md"):
+        if old.name not in packages:
+            old.unlink(missing_ok=True)
+
+    import json
+
+    manifest = {
+        "generator_version": GENERATOR_VERSION,
+        "pool_hash": channel.pool_hash(),
+        "phrase_source": PHRASE_SOURCE,
+        "seed_scheme": SEED_SCHEME,
+        "packages": packages,
+    }
+    if SEO_CORPUS is not None:
+        manifest["seo_snapshot"] = SEO_CORPUS.digest[:16]
+    payload = json.dumps(manifest, indent=2, sort_keys=True) + "\n"
+    atomic_write_bytes(output_dir / MANIFEST_NAME, payload.encode("utf-8"))
     return written
 
 
+def archive_kind(target: Path) -> str:
+    name = target.name.lower()
+    if name.endswith(".zip"):
+        return "zip"
+    if name.endswith((".tar.gz", ".tgz")):
+        return "tar:gz"
+    if name.endswith(".tar"):
+        return "tar"
+    return "concat"
+
+
+def write_archive(rendered: Iterable[tuple[str, str]], target: Path) -> int:
+    import io
+    import tarfile
+    import zipfile
+
+    target.parent.mkdir(parents=True, exist_ok=True)
+    kind = archive_kind(target)
+    tmp = target.with_name(f".{target.name}.{os.getpid()}.tmp")
+    count = 0
+    try:
+        if kind == "zip":
+            with zipfile.ZipFile(tmp, "w", compression=zipfile.ZIP_DEFLATED) as zf:
+                for filename, markdown in rendered:
+                    info = zipfile.ZipInfo(filename, date_time=(1980, 1, 1, 0, 0, 0))
+                    info.compress_type = zipfile.ZIP_DEFLATED
+                    zf.writestr(info, markdown.encode("utf-8"))
+                    count += 1
+        elif kind.startswith("tar"):
+            with tarfile.open(tmp, "w:gz" if kind == "tar:gz" else "w") as tf:
+                for filename, markdown in rendered:
+                    data = markdown.encode("utf-8")
+                    info = tarfile.TarInfo(filename)
+                    info.size = len(data)
+                    info.mode = 0o644
+                    tf.addfile(info, io.BytesIO(data))
+                    count += 1
+        else:
+            with tmp.open("w", encoding="utf-8") as fh:
+                for filename, markdown in rendered:
+                    fh.write(f"<!-- file: {filename} -->\n")
+                    fh.write(markdown)
+                    count += 1
+        os.replace(tmp, target)
+    finally:
+        tmp.unlink(missing_ok=True)
+    return count
+
+
+def write_packages(contexts: list[PackageContext], output_dir: Path, validate: bool = False) -> list[Path]:
+    return write_horizon([contexts], output_dir, validate=validate)
+
+
 def main() -> None:
     args = parse_args()
-    contexts = build_contexts(get_base_date(args.base_date))
-    for path in write_packages(contexts, Path(args.output_dir)):
-        print(path.as_posix())
+    stats = enable_stats() if args.profile or args.stats_json else None
+    try:
+        run(args)
+    except ValidationError as exc:
+        raise SystemExit(f"error: {exc}") from None
+    except BrokenPipeError:
+        import sys
+
+        os.dup2(os.open(os.devnull, os.O_WRONLY), sys.stdout.fileno())
+        raise SystemExit(1) from None
+    finally:
+        if stats is not None:
+            import json
+
+            from nad_stats import print_report
+
+            report = stats.report(pool_sizes())
+            if args.stats_json:
+                Path(args.stats_json).write_text(json.dumps(report, indent=2) + "\n", encoding="utf-8")
+            if args.profile:
+                print_report(report)
+
+
+def channel_weeks(args: argparse.Namespace, channel: Channel = DEFAULT_CHANNEL) -> list[list[PackageContext]]:
+    base = get_base_date(args.from_date or args.base_date, channel)
+    if args.to_date:
+        bases = horizon_bases_until(base, date.fromisoformat(args.to_date), channel)
+    else:
+        bases = horizon_bases(base, args.weeks or 1, channel)
+    if not bases:
+        raise SystemExit(f"error: no publish slots for channel '{channel.name}' between {base} and {args.to_date}")
+    return [build_contexts(b, channel) for b in bases]
+
+
+def stream_records(horizon: Iterable[list[tuple]], fmt: str, target: str) -> Iterator[list[tuple[str, str]]]:
+    import json
+    import sys
+
+    fh = sys.stdout if target == "-" else open(target, "w", encoding="utf-8")
+    try:
+        if fmt == "json":
+            fh.write(f'{{"schema_version": {RECORD_SCHEMA_VERSION}, "packages": [')
+        separator = "\n  "
+        for week in horizon:
+            for _, _, record in week:
+                line = json.dumps(record, ensure_ascii=False)
+                if fmt == "json":
+                    fh.write(separator + line)
+                    separator = ",\n  "
+                else:
+                    fh.write(line + "\n")
+            fh.flush()
+            yield [(filename, markdown) for filename, markdown, _ in week]
+        if fmt == "json":
+            fh.write("\n]}\n")
+    finally:
+        if fh is not sys.stdout:
+            fh.close()
+
+
+def validated_horizon(horizon: Iterable[list[tuple]], weeks: list[list[PackageContext]]) -> Iterator[list[tuple]]:
+    for rendered, contexts in zip(horizon, weeks):
+        validate_rendered([item[:2] for item in rendered], contexts[0].channel)
+        yield rendered
+
+
+def publish(
+    args: argparse.Namespace,
+    weeks: list[list[PackageContext]],
+    horizon: Iterable[list[tuple]],
+    channels: list[Channel],
+    per_channel_dirs: bool = False,
+) -> None:
+    if args.validate:
+        horizon = validated_horizon(horizon, weeks)
+    if args.format != "markdown":
+        horizon = stream_records(horizon, args.format, args.records)
+    if args.format in ("ndjson", "json"):
+        for _ in horizon:
+            pass
+        return
+    show = args.format == "markdown" or args.records != "-"
+    if args.archive:
+        items = (
+            (f"{contexts[0].channel.name}/{filename}" if per_channel_dirs else filename, markdown)
+            for rendered, contexts in zip(horizon, weeks)
+            for filename, markdown in rendered
+        )
+        count = write_archive(items, Path(args.archive))
+        if show:
+            print(f"{args.archive} ({count} packages)")
+        return
+    by_channel: dict[Channel, list[tuple[str, str]]] = {channel: [] for channel in channels}
+    for rendered, contexts in zip(horizon, weeks):
+        by_channel[contexts[0].channel].extend(rendered)
+    output_dir = Path(args.output_dir)
+    for channel, rendered in by_channel.items():
+        target = output_dir / channel.name if per_channel_dirs else output_dir
+        written = write_rendered(rendered, target, channel=channel)
+        if show:
+            for path in written:
+                print(path.as_posix())
+
+
+def run(args: argparse.Namespace) -> None:
+    set_seed_scheme(args.seed_scheme)
+    set_phrase_source(args.phrase_source)
+    set_seo_corpus(args.seo_corpus, args.seo_strength)
+    set_strict_tracklists(args.validate)
+    records = args.format != "markdown"
+    if args.channels:
+        weeks = [contexts for channel in args.channels for contexts in channel_weeks(args, channel)]
+        horizon = iter_horizon(
+            weeks, workers=args.workers, unique_titles=args.unique_titles, records=records, variants=args.variants
+        )
+        publish(args, weeks, horizon, args.channels, per_channel_dirs=True)
+        return
+    weeks = channel_weeks(args)
+    if args.incremental:
+        import generate_packages
+        from nad_deps import print_report, regenerate
+
+        try:
+            report = regenerate(weeks, Path(args.output_dir), args.validate, generation_settings(), STATS)
+        except generate_packages.ValidationError as exc:
+            raise ValidationError(str(exc)) from None
+        print_report(report)
+        return
+    if not args.ledger:
+        horizon = iter_horizon(
+            weeks, workers=args.workers, unique_titles=args.unique_titles, records=records, variants=args.variants
+        )
+        publish(args, weeks, horizon, [DEFAULT_CHANNEL])
+        return
+
+    from nad_ledger import UsageLedger
+
+    with UsageLedger(Path(args.ledger)) as ledger:
+        if args.bootstrap_ledger:
+            bootstrap_ledger(ledger, Path(args.output_dir))
+        horizon = iter_horizon(weeks, ledger=ledger, avoid_weeks=args.avoid_weeks, records=records)
+        publish(args, weeks, horizon, [DEFAULT_CHANNEL])
 
 
 if __name__ == "__main__":
@@ -0,0 +1,66 @@
+#!/usr/bin/env python3
+from __future__ import annotations
+
+import argparse
+import os
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+
+SRC_DIR = Path(__file__).resolve().parent
+SCRIPT = SRC_DIR / "generate_packages.py"
+CHECK_BASE_DATE = "2026-01-05"
+SEO_ROWS = "keyword,volume,ctr\nnoir jazz,5400,4.1%\nlate night bar,1900,3.2%\nrainy night jazz,880,2.5%\n"
+SETTINGS = {
+    "default": [],
+    "seed-v2": ["--seed-scheme", "v2"],
+    "grammar": ["--phrase-source", "grammar"],
+    "seo": ["--seo-corpus", "{seo}"],
+}
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Check that --incremental output matches a full run")
+    parser.add_argument("--weeks", type=int, default=4, help="Horizon length for each comparison.")
+    args = parser.parse_args()
+    if args.weeks < 1:
+        parser.error("--weeks must be at least 1")
+    return args
+
+
+def generate(output_dir: Path, options: list[str], env: dict[str, str]) -> None:
+    cmd = [sys.executable, str(SCRIPT), "--base-date", CHECK_BASE_DATE, "--output-dir", str(output_dir), *options]
+    subprocess.run(cmd, env=env, capture_output=True, check=True)
+
+
+def package_bytes(output_dir: Path) -> dict[str, bytes]:
+    return {path.name: path.read_bytes() for path in sorted(output_dir.glob("*.md"))}
+
+
+def main() -> None:
+    args = parse_args()
+    failures: list[str] = []
+    with tempfile.TemporaryDirectory() as tmp:
+        root = Path(tmp)
+        seo = root / "seo.csv"
+        seo.write_text(SEO_ROWS, encoding="utf-8")
+        env = dict(os.environ, NAD_CATALOG_CACHE=str(root / "catalog"))
+        for name, options in SETTINGS.items():
+            options = [option.format(seo=seo) for option in [*options, "--weeks", str(args.weeks)]]
+            full, incremental = root / name / "full", root / name / "incremental"
+            generate(full, options, env)
+            for _ in range(2):
+                generate(incremental, [*options, "--incremental"], env)
+            expected, found = package_bytes(full), package_bytes(incremental)
+            differing = sorted(n for n in expected.keys() | found.keys() if expected.get(n) != found.get(n))
+            print(f"{name}: {len(expected)} packages, {len(differing)} differ")
+            if differing:
+                failures.append(f"{name} ({differing[0]})")
+    if failures:
+        print(f"Incremental output differs from a full run: {', '.join(failures)}", file=sys.stderr)
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,148 @@
+from __future__ import annotations
+
+from bisect import bisect_left, bisect_right
+from collections.abc import Iterable
+from dataclasses import dataclass, field
+from datetime import date, timedelta
+from heapq import merge
+
+WEEKDAY_LABELS = ("MON", "TUE", "WED", "THU", "FRI", "SAT", "SUN")
+RRULE_DAYS = ("MO", "TU", "WE", "TH", "FR", "SA", "SU")
+RRULE_KEYS = frozenset({"FREQ", "INTERVAL", "BYDAY"})
+EPOCH = date(2000, 1, 3)
+ONE_DAY = timedelta(days=1)
+
+
+@dataclass(frozen=True)
+class Slot:
+    index: int
+    date: date
+    label: str
+
+
+def _contains(items: tuple[date, ...], day: date) -> bool:
+    pos = bisect_left(items, day)
+    return pos < len(items) and items[pos] == day
+
+
+@dataclass(frozen=True)
+class Calendar:
+    weekdays: tuple[int, ...]
+    interval: int = 1
+    anchor: date = EPOCH
+    blackouts: tuple[date, ...] = ()
+    extras: tuple[date, ...] = ()
+
+    def __post_init__(self) -> None:
+        if not self.weekdays or any(not 0 <= day <= 6 for day in self.weekdays):
+            raise ValueError("calendar needs at least one weekday in 0..6")
+        if self.interval < 1:
+            raise ValueError("calendar interval must be at least 1 week")
+        assign = object.__setattr__
+        assign(self, "weekdays", tuple(sorted(set(self.weekdays))))
+        assign(self, "anchor", self.anchor - timedelta(days=self.anchor.weekday()))
+        blackouts = set(self.blackouts)
+        assign(self, "blackouts", tuple(sorted(day for day in blackouts if self.is_regular(day))))
+        extras = {day for day in self.extras if day not in blackouts and not self.is_regular(day)}
+        assign(self, "extras", tuple(sorted(extras)))
+
+    @property
+    def slots_per_week(self) -> int:
+        return len(self.weekdays)
+
+    def is_regular(self, day: date) -> bool:
+        return day.weekday() in self.weekdays and (day - self.anchor).days // 7 % self.interval == 0
+
+    def is_slot(self, day: date) -> bool:
+        if self.is_regular(day):
+            return not _contains(self.blackouts, day)
+        return _contains(self.extras, day)
+
+    def regular_before(self, day: date) -> int:
+        week, weekday = divmod((day - self.anchor).days, 7)
+        count = -(-week // self.interval) * len(self.weekdays)
+        if week % self.interval == 0:
+            count += bisect_left(self.weekdays, weekday)
+        return count
+
+    def regular_at(self, k: int) -> date:
+        cycle, pos = divmod(k, len(self.weekdays))
+        return self.anchor + timedelta(days=7 * cycle * self.interval + self.weekdays[pos])
+
+    def index(self, day: date) -> int:
+        return self.regular_before(day) - bisect_left(self.blackouts, day) + bisect_left(self.extras, day)
+
+    def slot(self, k: int) -> Slot:
+        lo = self.regular_at(k - len(self.extras)).toordinal()
+        hi = self.regular_at(k + len(self.blackouts)).toordinal()
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if self.index(date.fromordinal(mid + 1)) > k:
+                hi = mid
+            else:
+                lo = mid + 1
+        day = date.fromordinal(lo)
+        return Slot(k, day, WEEKDAY_LABELS[day.weekday()])
+
+    def after(self, day: date, count: int) -> list[Slot]:
+        first = self.index(day + ONE_DAY)
+        return [self.slot(k) for k in range(first, first + count)]
+
+    def between(self, start: date, end: date) -> list[Slot]:
+        stop = end + ONE_DAY
+        regular = (self.regular_at(k) for k in range(self.regular_before(start), self.regular_before(stop)))
+        extras = self.extras[bisect_left(self.extras, start) : bisect_right(self.extras, end)]
+        days = (day for day in merge(regular, extras) if not _contains(self.blackouts, day))
+        first = self.index(start)
+        return [Slot(first + i, day, WEEKDAY_LABELS[day.weekday()]) for i, day in enumerate(days)]
+
+    def schedule(self, start: date, end: date) -> Schedule:
+        return Schedule(self.between(start, end))
+
+
+@dataclass
+class Schedule:
+    slots: list[Slot]
+    by_date: dict[date, Slot] = field(init=False)
+
+    def __post_init__(self) -> None:
+        self.by_date = {slot.date: slot for slot in self.slots}
+
+    def get(self, day: date) -> Slot | None:
+        return self.by_date.get(day)
+
+    def year(self, year: int) -> list[Slot]:
+        lo = bisect_left(self.slots, date(year, 1, 1), key=lambda slot: slot.date)
+        hi = bisect_left(self.slots, date(year + 1, 1, 1), key=lambda slot: slot.date)
+        return self.slots[lo:hi]
+
+
+def parse_rule(rule: str) -> tuple[tuple[int, ...], int]:
+    parts: dict[str, str] = {}
+    for part in rule.upper().split(";"):
+        key, sep, value = part.strip().partition("=")
+        if not sep:
+            raise ValueError(f"malformed cadence part '{part}' in '{rule}'")
+        parts[key] = value
+    unknown = set(parts) - RRULE_KEYS
+    if unknown:
+        raise ValueError(f"unsupported cadence keys {', '.join(sorted(unknown))} in '{rule}'")
+    if parts.get("FREQ") != "WEEKLY":
+        raise ValueError(f"only FREQ=WEEKLY cadences are supported: '{rule}'")
+    days = [day.strip() for day in parts.get("BYDAY", "").split(",") if day.strip()]
+    if not days or any(day not in RRULE_DAYS for day in days):
+        raise ValueError(f"BYDAY must list days from {','.join(RRULE_DAYS)}: '{rule}'")
+    interval = int(parts.get("INTERVAL", "1"))
+    return tuple(RRULE_DAYS.index(day) for day in days), interval
+
+
+def parse_dates(items: Iterable[str]) -> tuple[date, ...]:
+    days: list[date] = []
+    for item in items:
+        start, sep, end = item.partition("..")
+        first = date.fromisoformat(start.strip())
+        last = date.fromisoformat(end.strip()) if sep else first
+        if last < first:
+            raise ValueError(f"date range ends before it starts: '{item}'")
+        days.extend(first + timedelta(days=i) for i in range((last - first).days + 1))
+    return tuple(days)
@@ -0,0 +1,232 @@
+#!/usr/bin/env python3
+from __future__ import annotations
+
+import hashlib
+import mmap
+import os
+import struct
+import weakref
+from collections.abc import Iterator, Sequence
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    import argparse
+
+POOLS_DIR = Path(__file__).resolve().parent.parent / "prompts" / "pools"
+CACHE_DIR = Path(os.environ.get("NAD_CATALOG_CACHE", Path(__file__).resolve().parent.parent / ".catalog"))
+MAGIC = b"NADCAT01"
+HEADER = struct.Struct("<8s32sI")
+DIRECTORY_ENTRY = struct.Struct("<HIQ")
+OFFSET = struct.Struct("<Q")
+
+
+def read_pool_file(path: Path) -> list[str]:
+    entries: list[str] = []
+    for raw in path.read_text(encoding="utf-8").splitlines():
+        line = raw.strip()
+        if line and not line.startswith("#"):
+            entries.append(line)
+    return entries
+
+
+def source_files(source_dir: Path) -> list[Path]:
+    return sorted(source_dir.glob("*.txt"))
+
+
+def source_fingerprint(source_dir: Path) -> str:
+    h = hashlib.sha256()
+    for path in source_files(source_dir):
+        st = path.stat()
+        h.update(f"{path.name}|{st.st_size}|{st.st_mtime_ns}\n".encode("utf-8"))
+    return h.hexdigest()[:16]
+
+
+def source_key(source_dir: Path) -> str:
+    return hashlib.sha256(str(source_dir.resolve()).encode("utf-8")).hexdigest()[:8]
+
+
+def compile_catalog(source_dir: Path) -> bytes:
+    pools = {path.stem: read_pool_file(path) for path in source_files(source_dir)}
+    digest = hashlib.sha256()
+    for name, entries in pools.items():
+        digest.update(name.encode("utf-8") + b"\0")
+        for entry in entries:
+            digest.update(entry.encode("utf-8") + b"\n")
+        digest.update(b"\0")
+
+    directory_size = sum(DIRECTORY_ENTRY.size + len(name.encode("utf-8")) for name in pools)
+    cursor = HEADER.size + directory_size
+    directory = bytearray()
+    tables = bytearray()
+    blobs = bytearray()
+    table_sizes = sum(OFFSET.size * (len(entries) + 1) for entries in pools.values())
+    blob_start = cursor + table_sizes
+    for name, entries in pools.items():
+        encoded_name = name.encode("utf-8")
+        directory += DIRECTORY_ENTRY.pack(len(encoded_name), len(entries), cursor + len(tables)) + encoded_name
+        for entry in entries:
+            tables += OFFSET.pack(blob_start + len(blobs))
+            blobs += entry.encode("utf-8")
+        tables += OFFSET.pack(blob_start + len(blobs))
+    return HEADER.pack(MAGIC, digest.digest(), len(pools)) + directory + tables + blobs
+
+
+class Catalog:
+    def __init__(self, buffer: mmap.mmap | bytes, fingerprint: str = "") -> None:
+        magic, digest, count = HEADER.unpack_from(buffer, 0)
+        if magic != MAGIC:
+            raise ValueError("Not a NAD catalog file")
+        self.buffer = buffer
+        self.fingerprint = fingerprint
+        self.digest = digest.hex()
+        self.tables: dict[str, tuple[int, int]] = {}
+        cursor = HEADER.size
+        for _ in range(count):
+            name_len, entry_count, table_pos = DIRECTORY_ENTRY.unpack_from(buffer, cursor)
+            cursor += DIRECTORY_ENTRY.size
+            name = bytes(buffer[cursor : cursor + name_len]).decode("utf-8")
+            cursor += name_len
+            self.tables[name] = (entry_count, table_pos)
+
+    def count(self, name: str) -> int:
+        return self.tables[name][0]
+
+    def entry(self, name: str, idx: int) -> str:
+        count, table_pos = self.tables[name]
+        if not 0 <= idx < count:
+            raise IndexError(f"{name}[{idx}] out of range")
+        start = OFFSET.unpack_from(self.buffer, table_pos + idx * OFFSET.size)[0]
+        end = OFFSET.unpack_from(self.buffer, table_pos + (idx + 1) * OFFSET.size)[0]
+        return bytes(self.buffer[start:end]).decode("utf-8")
+
+
+def _map_file(path: Path) -> mmap.mmap:
+    with path.open("rb") as fh:
+        return mmap.mmap(fh.fileno(), 0, access=mmap.ACCESS_READ)
+
+
+def open_catalog(source_dir: Path = POOLS_DIR, cache_dir: Path = CACHE_DIR) -> Catalog:
+    key = source_key(source_dir)
+    fingerprint = source_fingerprint(source_dir)
+    target = cache_dir / f"catalog-{key}-{fingerprint}.bin"
+    if target.exists():
+        try:
+            return Catalog(_map_file(target), fingerprint)
+        except (OSError, ValueError):
+            pass
+
+    compiled = compile_catalog(source_dir)
+    try:
+        cache_dir.mkdir(parents=True, exist_ok=True)
+        for stale in cache_dir.glob(f"catalog-{key}-*.bin"):
+            if stale != target:
+                stale.unlink(missing_ok=True)
+        tmp = target.with_suffix(f".{os.getpid()}.tmp")
+        tmp.write_bytes(compiled)
+        os.replace(tmp, target)
+        return Catalog(_map_file(target), fingerprint)
+    except (OSError, ValueError):
+        return Catalog(compiled, fingerprint)
+
+
+_CATALOGS: dict[Path, Catalog] = {}
+_POOLS: weakref.WeakSet[CatalogPool] = weakref.WeakSet()
+
+
+def get_catalog(source_dir: Path = POOLS_DIR) -> Catalog:
+    found = _CATALOGS.get(source_dir)
+    if found is None:
+        found = _CATALOGS[source_dir] = open_catalog(source_dir)
+    return found
+
+
+def refresh_catalogs() -> bool:
+    stale = [source_dir for source_dir, found in _CATALOGS.items() if found.fingerprint != source_fingerprint(source_dir)]
+    for source_dir in stale:
+        del _CATALOGS[source_dir]
+    if stale:
+        for pool in _POOLS:
+            pool.reset()
+    return bool(stale)
+
+
+class CatalogPool(Sequence[str]):
+    def __init__(self, name: str, source_dir: Path = POOLS_DIR) -> None:
+        self.name = name
+        self.source_dir = source_dir
+        self.reset()
+        _POOLS.add(self)
+
+    def reset(self) -> None:
+        self._entries: list[str | None] | None = None
+        self._all: tuple[str, ...] | None = None
+        self._members: frozenset[str] | None = None
+
+    @property
+    def catalog(self) -> Catalog:
+        return get_catalog(self.source_dir)
+
+    def __len__(self) -> int:
+        if self._all is not None:
+            return len(self._all)
+        return self.catalog.count(self.name)
+
+    def __getitem__(self, idx):  # type: ignore[override]
+        if isinstance(idx, slice):
+            return list(self.entries()[idx])
+        if self._all is not None:
+            return self._all[idx]
+        if self._entries is None:
+            self._entries = [None] * len(self)
+        if idx < 0:
+            idx += len(self._entries)
+        found = self._entries[idx]
+        if found is None:
+            found = self._entries[idx] = self.catalog.entry(self.name, idx)
+        return found
+
+    def entries(self) -> tuple[str, ...]:
+        if self._all is None:
+            self._all = tuple(self[i] for i in range(len(self)))
+            self._entries = None
+        return self._all
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.entries())
+
+    def __contains__(self, value: object) -> bool:
+        if self._members is None:
+            self._members = frozenset(self.entries())
+        return value in self._members
+
+    def __hash__(self) -> int:
+        return hash((self.catalog.digest, self.name))
+
+    def __eq__(self, other: object) -> bool:
+        if isinstance(other, CatalogPool):
+            return (self.catalog.digest, self.name) == (other.catalog.digest, other.name)
+        return NotImplemented
+
+    def __repr__(self) -> str:
+        return f"CatalogPool({self.name!r})"
+
+
+def parse_args() -> argparse.Namespace:
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Compile the NAD content catalog")
+    parser.add_argument("--source-dir", default=str(POOLS_DIR), help="Directory of *.txt pool files.")
+    return parser.parse_args()
+
+
+def main() -> None:
+    args = parse_args()
+    catalog = get_catalog(Path(args.source_dir))
+    print(f"digest: {catalog.digest}")
+    for name, (count, _) in sorted(catalog.tables.items()):
+        print(f"{name}: {count}")
+
+
+if __name__ == "__main__":
+    main()
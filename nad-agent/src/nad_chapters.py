@@ -0,0 +1,243 @@
+#!/usr/bin/env python3
+from __future__ import annotations
+
+import argparse
+import mmap
+import os
+import re
+import struct
+import sys
+from dataclasses import dataclass, field
+from pathlib import Path
+
+import generate_packages as gp
+
+WINDOW_SECONDS = 0.25
+PROBE_RATE = 2000
+WAVE_FORMAT_PCM = 1
+WAVE_FORMAT_EXTENSIBLE = 0xFFFE
+CHAPTER_LINE_RE = re.compile(r"- \d+:\d{2}(?::\d{2})? (.+)$")
+UNSUPPORTED_SUFFIXES = (".flac", ".mp3", ".ogg", ".m4a", ".aiff", ".aif")
+
+
+@dataclass
+class WavInfo:
+    channels: int
+    rate: int
+    width: int
+    data_offset: int
+    data_size: int
+
+    @property
+    def frames(self) -> int:
+        return self.data_size // (self.width * self.channels)
+
+
+@dataclass
+class MixAnalysis:
+    duration: float
+    boundaries: list[float] = field(default_factory=list)
+
+
+@dataclass
+class ChapterResult:
+    package: str
+    duration: str
+    tracks: int
+    chapters: int
+    error: str | None = None
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Replace template chapter timestamps with ones from the final mix")
+    parser.add_argument("packages", nargs="+", help="Package markdown files or directories of them.")
+    parser.add_argument(
+        "--mixes",
+        required=True,
+        help="Directory holding <package>.wav or a <package>/ directory of per-track WAV files.",
+    )
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1, help="Worker processes.")
+    parser.add_argument("--silence-db", type=float, default=-45.0, help="Peak level (dBFS) treated as silence.")
+    parser.add_argument("--min-gap", type=float, default=1.0, help="Seconds of silence that separate two tracks.")
+    parser.add_argument("--dry-run", action="store_true", help="Report what would change without rewriting files.")
+    args = parser.parse_args()
+    if args.workers < 1:
+        parser.error("--workers must be at least 1")
+    if args.silence_db >= 0:
+        parser.error("--silence-db must be negative")
+    return args
+
+
+def read_wav_info(buffer: mmap.mmap, name: str) -> WavInfo:
+    if buffer[:4] != b"RIFF" or buffer[8:12] != b"WAVE":
+        raise ValueError(f"{name} is not a RIFF/WAVE file")
+    fmt: tuple[int, int, int, int] | None = None
+    pos = 12
+    while pos + 8 <= len(buffer):
+        chunk_id, size = struct.unpack_from("<4sI", buffer, pos)
+        body = pos + 8
+        if chunk_id == b"fmt ":
+            audio_format, channels, rate, _, _, bits = struct.unpack_from("<HHIIHH", buffer, body)
+            if audio_format == WAVE_FORMAT_EXTENSIBLE and size >= 26:
+                audio_format = struct.unpack_from("<H", buffer, body + 24)[0]
+            if audio_format != WAVE_FORMAT_PCM:
+                raise ValueError(f"{name}: only integer PCM WAV is supported (format {audio_format:#x})")
+            fmt = (channels, rate, (bits + 7) // 8, bits)
+        elif chunk_id == b"data":
+            if fmt is None:
+                raise ValueError(f"{name}: data chunk before fmt chunk")
+            channels, rate, width, _ = fmt
+            return WavInfo(channels, rate, width, body, min(size, len(buffer) - body))
+        pos = body + size + (size & 1)
+    raise ValueError(f"{name}: no PCM data chunk")
+
+
+def window_peaks(buffer: mmap.mmap, info: WavInfo, window_seconds: float = WINDOW_SECONDS) -> list[float]:
+    frame_bytes = info.width * info.channels
+    window_frames = max(1, int(info.rate * window_seconds))
+    stride = max(1, info.rate // PROBE_RATE)
+    data = memoryview(buffer)[info.data_offset : info.data_offset + info.frames * frame_bytes]
+    if info.width in (2, 4):
+        samples = data.cast("h" if info.width == 2 else "i")[:: info.channels * stride]
+        full_scale, offset = float(1 << (8 * info.width - 1)), 0
+    elif info.width == 1:
+        samples = data[:: frame_bytes * stride]
+        full_scale, offset = 128.0, 128
+    else:
+        samples = data.cast("b")[info.width - 1 :: frame_bytes * stride]
+        full_scale, offset = 128.0, 0
+    per_window = max(1, window_frames // stride)
+    peaks: list[float] = []
+    for start in range(0, len(samples), per_window):
+        chunk = samples[start : start + per_window]
+        peaks.append(max(max(chunk) - offset, offset - min(chunk)) / full_scale)
+    return peaks
+
+
+def track_starts(peaks: list[float], threshold: float, min_gap: float, window_seconds: float = WINDOW_SECONDS) -> list[float]:
+    min_windows = max(1, round(min_gap / window_seconds))
+    starts: list[float] = []
+    heard = False
+    silent = 0
+    for idx, peak in enumerate(peaks):
+        if peak < threshold:
+            silent += 1
+            continue
+        if heard and silent >= min_windows:
+            starts.append(idx * window_seconds)
+        heard = True
+        silent = 0
+    return starts
+
+
+def analyze_file(path: Path, threshold: float, min_gap: float) -> tuple[float, list[float]]:
+    if path.suffix.lower() in UNSUPPORTED_SUFFIXES:
+        raise ValueError(f"{path.name}: only WAV is supported; export the mix as PCM WAV")
+    with path.open("rb") as fh, mmap.mmap(fh.fileno(), 0, access=mmap.ACCESS_READ) as buffer:
+        info = read_wav_info(buffer, path.name)
+        duration = info.frames / info.rate
+        return duration, track_starts(window_peaks(buffer, info), threshold, min_gap)
+
+
+def analyze_mix(paths: list[Path], threshold: float, min_gap: float) -> MixAnalysis:
+    if len(paths) == 1:
+        duration, boundaries = analyze_file(paths[0], threshold, min_gap)
+        return MixAnalysis(duration, boundaries)
+    analysis = MixAnalysis(0.0)
+    for path in paths:
+        if analysis.duration:
+            analysis.boundaries.append(analysis.duration)
+        analysis.duration += analyze_file(path, threshold, min_gap)[0]
+    return analysis
+
+
+def place_chapters(count: int, analysis: MixAnalysis) -> list[int]:
+    total = int(analysis.duration)
+    step = total // (count - 1)
+    candidates = [0, *(int(b) for b in analysis.boundaries if 0 < b < total)]
+    placed = [0]
+    for idx in range(1, count):
+        target = idx * step
+        later = [c for c in candidates if c > placed[-1]]
+        best = min(later, key=lambda c: abs(c - target), default=None)
+        if best is None or abs(best - target) > step / 2:
+            best = max(target, placed[-1] + 1)
+        placed.append(best)
+    return placed
+
+
+def rewrite_chapters(text: str, analysis: MixAnalysis) -> tuple[str, int]:
+    lines = text.split("\n")
+    section = ""
+    chapter_rows: list[tuple[int, str]] = []
+    for idx, line in enumerate(lines):
+        if line.startswith("#"):
+            section = line.lstrip("#").strip()
+        elif section == "Chapters (template)" and (m := CHAPTER_LINE_RE.match(line)):
+            chapter_rows.append((idx, m.group(1)))
+        elif line.startswith("duration_target: ") and not section:
+            lines[idx] = f"duration_target: {gp.format_hms(round(analysis.duration))}"
+    if len(chapter_rows) < 2:
+        raise ValueError("package has no chapter lines to rewrite")
+    for (idx, label), ts in zip(chapter_rows, place_chapters(len(chapter_rows), analysis)):
+        mm, ss = divmod(ts, 60)
+        lines[idx] = f"- {mm:02d}:{ss:02d} {label}"
+    return "\n".join(lines), len(chapter_rows)
+
+
+def mix_files(mixes: Path, stem: str) -> list[Path]:
+    folder = mixes / stem
+    if folder.is_dir():
+        return sorted(p for p in folder.iterdir() if p.suffix.lower() in (".wav", *UNSUPPORTED_SUFFIXES))
+    return [p for p in (mixes / f"{stem}{suffix}" for suffix in (".wav", *UNSUPPORTED_SUFFIXES)) if p.exists()][:1]
+
+
+def process_package(job: tuple[str, str, float, float, bool]) -> ChapterResult:
+    package, mixes, threshold, min_gap, dry_run = job
+    path = Path(package)
+    files = mix_files(Path(mixes), path.stem)
+    if not files:
+        return ChapterResult(path.name, "-", 0, 0, f"no mix found for {path.stem} in {mixes}")
+    try:
+        analysis = analyze_mix(files, threshold, min_gap)
+        text, chapters = rewrite_chapters(path.read_text(encoding="utf-8"), analysis)
+    except (OSError, ValueError, struct.error) as exc:
+        return ChapterResult(path.name, "-", 0, 0, str(exc))
+    if not dry_run:
+        gp.atomic_write_bytes(path, text.encode("utf-8"))
+    duration = gp.format_hms(round(analysis.duration))
+    return ChapterResult(path.name, duration, len(analysis.boundaries) + 1, chapters)
+
+
+def package_paths(items: list[str]) -> list[str]:
+    paths: list[str] = []
+    for item in items:
+        path = Path(item)
+        paths.extend(str(p) for p in sorted(path.glob("*.md"))) if path.is_dir() else paths.append(str(path))
+    return paths
+
+
+def main() -> None:
+    args = parse_args()
+    threshold = 10 ** (args.silence_db / 20)
+    jobs = [(p, args.mixes, threshold, args.min_gap, args.dry_run) for p in package_paths(args.packages)]
+    if args.workers <= 1 or len(jobs) < 2:
+        results = list(map(process_package, jobs))
+    else:
+        from concurrent.futures import ProcessPoolExecutor
+
+        with ProcessPoolExecutor(max_workers=min(args.workers, len(jobs))) as pool:
+            results = list(pool.map(process_package, jobs))
+    failed = 0
+    for result in results:
+        if result.error:
+            failed += 1
+            print(f"{result.package}: {result.error}", file=sys.stderr)
+            continue
+        print(f"{result.package}: {result.duration}, {result.tracks} tracks, {result.chapters} chapters")
+    if failed:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,197 @@
+from __future__ import annotations
+
+import hashlib
+import json
+from collections.abc import Callable
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+import generate_packages as gp
+
+if TYPE_CHECKING:
+    from nad_stats import RunStats
+
+DEPS_NAME = ".deps.json"
+DEPS_VERSION = 2
+GRAMMAR_POOLS = ("grammar_templates", "grammar_subjects", "grammar_verbs", "grammar_modifiers", "grammar_moods")
+STORY_POOLS = frozenset({"narrative_lines", "overheard_quotes"})
+CONTEXT_FIELDS = ("keyword", "duration_target")
+
+
+@dataclass(frozen=True)
+class Section:
+    pools: tuple[str, ...]
+    build: Callable[[gp.PackageContext], object]
+    context: tuple[str, ...] = ()
+
+
+PACKAGE_SECTIONS = {
+    "seo_paragraph": Section(("seo_context",), gp.build_seo_paragraph, ("keyword",)),
+    "about": Section(("about_nad_lines",), gp.pick_about_lines),
+    "late_line": Section(("optional_late_lines",), gp.pick_late_line),
+    "tags": Section(("tag_pool",), gp.pick_tag_list),
+    "chapters": Section(("chapter_moments",), gp.chapter_records, ("duration_target",)),
+}
+
+
+@dataclass
+class IncrementalReport:
+    changed_pools: list[str]
+    fresh: bool = False
+    weeks: int = 0
+    rebuilt: int = 0
+    updated: int = 0
+    packages: int = 0
+    changes: dict[str, list[str]] = field(default_factory=dict)
+
+
+def phrase_pools() -> frozenset[str]:
+    if gp.PHRASE_SOURCE == "grammar":
+        return frozenset({*GRAMMAR_POOLS, "primary_objects"})
+    return frozenset({"melancholic_phrases"})
+
+
+def tracklist_pools() -> frozenset[str]:
+    pools = {"suno_trackline_pool", "primary_objects"}
+    if gp.PHRASE_SOURCE == "grammar":
+        pools.update(GRAMMAR_POOLS)
+    return frozenset(pools)
+
+
+def pool_digests(channel: gp.Channel) -> dict[str, str]:
+    return {
+        name: hashlib.sha256("\n".join(channel.pool(name)).encode("utf-8")).hexdigest()[:16]
+        for name in gp.POOL_GLOBALS
+    }
+
+
+def state_settings(channel: gp.Channel) -> dict[str, object]:
+    return {
+        "deps_version": DEPS_VERSION,
+        "generator_version": gp.GENERATOR_VERSION,
+        "schema_version": gp.RECORD_SCHEMA_VERSION,
+        "channel": channel.name,
+        **gp.generation_settings(),
+    }
+
+
+def load_state(output_dir: Path, settings: dict[str, object]) -> dict:
+    try:
+        state = json.loads((output_dir / DEPS_NAME).read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return {"pools": {}, "weeks": {}}
+    if not isinstance(state, dict) or state.get("settings") != settings:
+        return {"pools": {}, "weeks": {}}
+    return state
+
+
+def same_slots(contexts: list[gp.PackageContext], records: list[dict]) -> bool:
+    return [(ctx.publish_date.isoformat(), ctx.weekday_label, ctx.series) for ctx in contexts] == [
+        (record["date"], record["weekday"], record["series"]) for record in records
+    ]
+
+
+def artifacts_from_records(records: list[dict]) -> gp.WeekArtifacts:
+    return gp.WeekArtifacts(
+        phrase_map={r["date"]: list(r["phrases"]) for r in records},
+        tracklist_map={r["date"]: list(r["tracklist"]) for r in records},
+        story_map={r["date"]: "\n".join(r["story"]) for r in records},
+        object_map={r["date"]: r["primary_object"] for r in records},
+    )
+
+
+def update_artifacts(contexts: list[gp.PackageContext], artifacts: gp.WeekArtifacts, changed: set[str]) -> set[str]:
+    dirty: set[str] = set()
+
+    def refresh(name: str, value: dict) -> None:
+        if value != getattr(artifacts, name):
+            setattr(artifacts, name, value)
+            dirty.add(name)
+
+    if changed & phrase_pools():
+        refresh("phrase_map", gp.pick_week_phrases(contexts))
+    if changed & STORY_POOLS:
+        refresh("story_map", gp.build_week_microstories(contexts, set()))
+    if "primary_objects" in changed:
+        refresh("object_map", gp.choose_primary_objects(contexts, set()))
+    if changed & tracklist_pools() or dirty & {"phrase_map", "object_map"}:
+        tracklists = gp.build_week_tracklists(contexts, artifacts.phrase_map, set(), artifacts.object_map)
+        refresh("tracklist_map", tracklists)
+    return dirty
+
+
+def update_record(ctx: gp.PackageContext, artifacts: gp.WeekArtifacts, old: dict, changed: set[str]) -> dict:
+    key = ctx.publish_date.isoformat()
+    record = gp.build_record(
+        ctx,
+        artifacts.phrase_map[key],
+        artifacts.story_map[key],
+        artifacts.tracklist_map[key],
+        artifacts.object_map.get(key),
+        sections={name: old[name] for name in PACKAGE_SECTIONS},
+    )
+    moved = {name for name in CONTEXT_FIELDS if record[name] != old[name]}
+    for name, section in PACKAGE_SECTIONS.items():
+        if changed.intersection(section.pools) or moved.intersection(section.context):
+            record[name] = section.build(ctx)
+    return record
+
+
+def regenerate(
+    weeks: list[list[gp.PackageContext]],
+    output_dir: Path,
+    validate: bool = False,
+    generation: dict[str, str] | None = None,
+    stats: RunStats | None = None,
+) -> IncrementalReport:
+    # The CLI runs as __main__, so this import is a second copy of the generator with default globals.
+    if generation is not None:
+        gp.apply_generation_settings(generation)
+    if stats is not None:
+        gp.STATS = stats
+    channel = weeks[0][0].channel if weeks else gp.DEFAULT_CHANNEL
+    settings = state_settings(channel)
+    state = load_state(output_dir, settings)
+    digests = pool_digests(channel)
+    changed = {name for name, digest in digests.items() if state["pools"].get(name) != digest}
+    report = IncrementalReport(changed_pools=sorted(changed), fresh=not state["pools"])
+    stored: dict[str, list[dict]] = {}
+    rendered: list[tuple[str, str]] = []
+    for contexts in weeks:
+        key = contexts[0].publish_date.isoformat()
+        old_records = state["weeks"].get(key)
+        report.weeks += 1
+        if old_records is None or not same_slots(contexts, old_records):
+            report.rebuilt += 1
+            records = [rendered_item[2] for rendered_item in gp.render_week(contexts, records=True)]
+            old_records = [{} for _ in contexts]
+        else:
+            artifacts = artifacts_from_records(old_records)
+            if changed:
+                update_artifacts(contexts, artifacts, changed)
+            records = [update_record(ctx, artifacts, old, changed) for ctx, old in zip(contexts, old_records)]
+        if records != old_records and state["weeks"].get(key) is not None:
+            report.updated += 1
+        for record, old in zip(records, old_records):
+            report.packages += 1
+            fields = [name for name in record if record[name] != old[name]] if old else ["new"]
+            if fields:
+                report.changes[record["filename"]] = fields
+            rendered.append((record["filename"], gp.render_record(record, channel)))
+        stored[key] = records
+
+    gp.write_rendered(rendered, output_dir, validate=validate, channel=channel)
+    payload = {"settings": settings, "pools": digests, "weeks": stored}
+    gp.atomic_write_bytes(output_dir / DEPS_NAME, (json.dumps(payload, ensure_ascii=False) + "\n").encode("utf-8"))
+    return report
+
+
+def print_report(report: IncrementalReport) -> None:
+    for filename, fields in report.changes.items():
+        print(f"{filename}: {', '.join(fields)}")
+    pools = "no previous state" if report.fresh else ", ".join(report.changed_pools) or "none"
+    print(
+        f"{report.weeks} weeks ({report.rebuilt} rebuilt, {report.updated} updated), "
+        f"{len(report.changes)}/{report.packages} packages changed; pools changed: {pools}"
+    )
@@ -0,0 +1,90 @@
+from __future__ import annotations
+
+import hashlib
+import math
+import re
+from bisect import bisect_right
+from collections.abc import Iterator, Mapping, Sequence
+from itertools import count
+
+SLOT = re.compile(r"\{([a-z]+)\}")
+FEISTEL_ROUNDS = 4
+MIX = 0x9E3779B97F4A7C15
+MASK64 = (1 << 64) - 1
+
+
+class Grammar:
+    def __init__(self, templates: Sequence[str], slots: Mapping[str, Sequence[str]]) -> None:
+        self.rules: list[tuple[list[str], list[Sequence[str]]]] = []
+        self.offsets: list[int] = []
+        total = 0
+        for template in templates:
+            pieces = SLOT.split(template)
+            choices = [slots[name] for name in pieces[1::2]]
+            self.rules.append((pieces[0::2], choices))
+            self.offsets.append(total)
+            total += math.prod(len(values) for values in choices)
+        self.size = total
+
+    def __len__(self) -> int:
+        return self.size
+
+    def phrase(self, idx: int) -> str:
+        rule = bisect_right(self.offsets, idx) - 1
+        literals, choices = self.rules[rule]
+        rest = idx - self.offsets[rule]
+        out = [literals[0]]
+        for values, literal in zip(choices, literals[1:]):
+            rest, pick = divmod(rest, len(values))
+            out.append(values[pick])
+            out.append(literal)
+        return "".join(out)
+
+    def round_keys(self, label: str) -> tuple[int, ...]:
+        digest = hashlib.blake2b(label.encode("utf-8"), digest_size=8 * FEISTEL_ROUNDS).digest()
+        return tuple(int.from_bytes(digest[i : i + 8], "big") for i in range(0, len(digest), 8))
+
+    def permute(self, idx: int, keys: tuple[int, ...]) -> int:
+        half = max(1, ((self.size - 1).bit_length() + 1) // 2)
+        mask = (1 << half) - 1
+        x = idx % self.size
+        while True:
+            left, right = x >> half, x & mask
+            for key in keys:
+                mixed = ((right ^ key) * MIX) & MASK64
+                left, right = right, left ^ ((mixed >> 29) & mask)
+            x = left << half | right
+            if x < self.size:
+                return x
+
+    def stream(self, label: str, start: int = 0) -> Iterator[str]:
+        keys = self.round_keys(label)
+        for i in count(start):
+            yield self.phrase(self.permute(i, keys))
+
+
+class BloomFilter:
+    def __init__(self, capacity: int, error_rate: float = 0.001) -> None:
+        self.bits = max(64, math.ceil(-capacity * math.log(error_rate) / math.log(2) ** 2))
+        self.hashes = max(1, round(self.bits / capacity * math.log(2)))
+        self.table = bytearray((self.bits + 7) // 8)
+
+    def positions(self, item: str) -> Iterator[int]:
+        digest = hashlib.blake2b(item.encode("utf-8"), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], "big")
+        h2 = int.from_bytes(digest[8:], "big") | 1
+        for i in range(self.hashes):
+            yield (h1 + i * h2) % self.bits
+
+    def add(self, item: str) -> None:
+        for pos in self.positions(item):
+            self.table[pos >> 3] |= 1 << (pos & 7)
+
+    def update(self, items: Iterator[str] | Sequence[str]) -> None:
+        for item in items:
+            self.add(item)
+
+    def __contains__(self, item: object) -> bool:
+        if not isinstance(item, str):
+            return False
+        return all(self.table[pos >> 3] >> (pos & 7) & 1 for pos in self.positions(item))
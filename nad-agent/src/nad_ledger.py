@@ -0,0 +1,71 @@
+from __future__ import annotations
+
+import sqlite3
+from collections.abc import Iterable
+from datetime import date, timedelta
+from pathlib import Path
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS usage (
+    package TEXT NOT NULL,
+    concept TEXT NOT NULL,
+    publish_date TEXT NOT NULL,
+    PRIMARY KEY (package, concept)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS usage_by_date ON usage (publish_date, concept);
+CREATE INDEX IF NOT EXISTS usage_by_concept ON usage (concept, publish_date);
+"""
+
+
+class UsageLedger:
+    def __init__(self, path: Path) -> None:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self.path = path
+        self.conn = sqlite3.connect(path)
+        self.conn.executescript(SCHEMA)
+
+    def __enter__(self) -> UsageLedger:
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        if exc_type is None:
+            self.conn.commit()
+        else:
+            self.conn.rollback()
+        self.close()
+
+    def close(self) -> None:
+        self.conn.close()
+
+    def record(self, package: str, publish_date: date, concepts: Iterable[str]) -> None:
+        self.conn.execute("DELETE FROM usage WHERE package = ?", (package,))
+        self.conn.executemany(
+            "INSERT OR IGNORE INTO usage (package, concept, publish_date) VALUES (?, ?, ?)",
+            ((package, concept, publish_date.isoformat()) for concept in concepts),
+        )
+
+    def recent(self, before: date, weeks: int) -> set[str]:
+        start = before - timedelta(weeks=weeks)
+        rows = self.conn.execute(
+            "SELECT DISTINCT concept FROM usage WHERE publish_date >= ? AND publish_date < ?",
+            (start.isoformat(), before.isoformat()),
+        )
+        return {concept for (concept,) in rows}
+
+    def last_used(self, concept: str, before: date | None = None) -> date | None:
+        limit = (before or date.max).isoformat()
+        row = self.conn.execute(
+            "SELECT MAX(publish_date) FROM usage WHERE concept = ? AND publish_date < ?",
+            (concept, limit),
+        ).fetchone()
+        return date.fromisoformat(row[0]) if row and row[0] else None
+
+    def concepts(self, prefix: str = "") -> list[str]:
+        rows = self.conn.execute(
+            "SELECT DISTINCT concept FROM usage WHERE concept >= ? AND concept < ? ORDER BY concept",
+            (prefix, prefix + "\U0010ffff"),
+        )
+        return [concept for (concept,) in rows]
+
+    def packages(self) -> int:
+        return self.conn.execute("SELECT COUNT(DISTINCT package) FROM usage").fetchone()[0]
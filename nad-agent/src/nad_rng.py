@@ -0,0 +1,73 @@
+from __future__ import annotations
+
+import hashlib
+import random
+import struct
+
+ROOT_KEY = b"nad-seed-v2"
+BLOCK_DRAWS = 32
+
+
+def root_key(*parts: str) -> bytes:
+    return hashlib.blake2b("|".join(parts).encode("utf-8"), digest_size=16, key=ROOT_KEY).digest()
+
+
+def substream_key(root: bytes, label: str) -> bytes:
+    return root + label.encode("utf-8")
+
+
+def stream_draws(key: bytes, count: int) -> tuple[int, ...]:
+    return struct.unpack(f"<{count}Q", hashlib.shake_128(key).digest(8 * count))
+
+
+class StreamRandom(random.Random):
+    def __init__(self, key: bytes) -> None:
+        super().__init__(key)
+
+    def seed(self, a=None, version=2) -> None:
+        self.key = bytes(a)
+        self.counter = 0
+        self.values: tuple[int, ...] = ()
+
+    def take(self, count: int) -> tuple[int, ...]:
+        start = self.counter
+        end = start + count
+        if end > len(self.values):
+            self.values = stream_draws(self.key, max(end, 2 * len(self.values), BLOCK_DRAWS))
+        self.counter = end
+        return self.values[start:end]
+
+    def next64(self) -> int:
+        i = self.counter
+        if i >= len(self.values):
+            self.values = stream_draws(self.key, max(i + 1, 2 * len(self.values), BLOCK_DRAWS))
+        self.counter = i + 1
+        return self.values[i]
+
+    def shuffle(self, x: list) -> None:
+        keys = self.take(len(x))
+        x[:] = [x[i] for i in sorted(range(len(x)), key=keys.__getitem__)]
+
+    def _randbelow(self, n: int) -> int:
+        # Rejection sampling on the top bit_length(n) bits; next64() % n would favour small values.
+        k = n.bit_length()
+        r = self.getrandbits(k)
+        while r >= n:
+            r = self.getrandbits(k)
+        return r
+
+    def getrandbits(self, k: int) -> int:
+        out = 0
+        for shift in range(0, k, 64):
+            out |= (self.next64() >> max(0, 64 - (k - shift))) << shift
+        return out
+
+    def random(self) -> float:
+        return (self.next64() >> 11) * (1.0 / (1 << 53))
+
+    def getstate(self) -> tuple[bytes, int]:
+        return self.key, self.counter
+
+    def setstate(self, state: tuple[bytes, int]) -> None:
+        self.seed(state[0])
+        self.counter = state[1]
@@ -0,0 +1,138 @@
+from __future__ import annotations
+
+import csv
+import hashlib
+import math
+import random
+import re
+from array import array
+from collections import defaultdict
+from collections.abc import Sequence
+from functools import lru_cache
+from pathlib import Path
+
+TOKEN_RE = re.compile(r"[a-z0-9]+")
+TERM_COLUMNS = ("keyword", "term", "query", "search term", "top queries")
+VOLUME_COLUMNS = ("volume", "search volume", "avg. monthly searches", "searches", "impressions")
+CTR_COLUMNS = ("ctr", "click-through rate", "impressions click-through rate (%)")
+DEFAULT_CTR = 0.02
+
+
+def tokens(text: str) -> tuple[str, ...]:
+    return tuple(TOKEN_RE.findall(text.lower()))
+
+
+def parse_number(raw: str) -> float:
+    text = raw.strip().replace(",", "")
+    if not text or text == "--":
+        return math.nan
+    if text.endswith("%"):
+        return float(text[:-1]) / 100
+    return float(text)
+
+
+def find_column(header: list[str], names: Sequence[str]) -> int | None:
+    lowered = [name.strip().lower() for name in header]
+    for name in names:
+        if name in lowered:
+            return lowered.index(name)
+    return None
+
+
+def read_rows(path: Path) -> list[tuple[str, float, float]]:
+    with path.open(encoding="utf-8-sig", newline="") as fh:
+        reader = csv.reader(fh)
+        header = next(reader, [])
+        term_col = find_column(header, TERM_COLUMNS)
+        volume_col = find_column(header, VOLUME_COLUMNS)
+        ctr_col = find_column(header, CTR_COLUMNS)
+        if term_col is None or volume_col is None:
+            raise ValueError(f"{path}: needs a keyword/term column and a volume column")
+        rows: list[tuple[str, float, float]] = []
+        for line, row in enumerate(reader, start=2):
+            if len(row) <= max(term_col, volume_col):
+                continue
+            try:
+                volume = parse_number(row[volume_col])
+                ctr = parse_number(row[ctr_col]) if ctr_col is not None and ctr_col < len(row) else math.nan
+            except ValueError:
+                raise ValueError(f"{path}:{line}: malformed number") from None
+            if ctr > 1:
+                ctr /= 100
+            term = " ".join(tokens(row[term_col]))
+            if term and volume > 0:
+                rows.append((term, volume, ctr))
+        return rows
+
+
+class SeoCorpus:
+    def __init__(self, rows: list[tuple[str, float, float]], source: str = "") -> None:
+        self.source = source
+        totals: dict[str, list[float]] = defaultdict(lambda: [0.0, 0.0, 0.0])
+        for term, volume, ctr in rows:
+            entry = totals[term]
+            entry[0] += volume
+            if not math.isnan(ctr):
+                entry[1] += volume * ctr
+                entry[2] += volume
+        self.terms = sorted(totals)
+        self.volume = array("d", (totals[term][0] for term in self.terms))
+        self.ctr = array("d", (t[1] / t[2] if t[2] else DEFAULT_CTR for t in map(totals.__getitem__, self.terms)))
+        self.weight = array("d", (math.log1p(v * c) for v, c in zip(self.volume, self.ctr)))
+        self.length = array("H", (len(term.split()) for term in self.terms))
+        postings: dict[str, array] = defaultdict(lambda: array("I"))
+        for idx, term in enumerate(self.terms):
+            for token in set(term.split()):
+                postings[token].append(idx)
+        self.postings = dict(postings)
+        digest = hashlib.sha256()
+        for term, volume, ctr in zip(self.terms, self.volume, self.ctr):
+            digest.update(f"{term}\t{volume!r}\t{ctr!r}\n".encode("utf-8"))
+        self.digest = digest.hexdigest()
+        self._scores: dict[str, float] = {}
+
+    def __len__(self) -> int:
+        return len(self.terms)
+
+    def score(self, text: str) -> float:
+        found = self._scores.get(text)
+        if found is not None:
+            return found
+        hits: dict[int, int] = defaultdict(int)
+        for token in set(tokens(text)):
+            for idx in self.postings.get(token, ()):
+                hits[idx] += 1
+        weight, length = self.weight, self.length
+        found = self._scores[text] = sum(weight[idx] for idx, count in hits.items() if count == length[idx])
+        return found
+
+    def scores(self, items: Sequence[str]) -> array:
+        return array("d", map(self.score, items))
+
+    def weights(self, items: Sequence[str], strength: float) -> array:
+        raw = self.scores(items)
+        top = max(raw, default=0.0) or 1.0
+        return array("d", (1.0 + strength * value / top for value in raw))
+
+    def order(self, rng: random.Random, items: Sequence[str], strength: float) -> list[str]:
+        keys = [math.log(1.0 - rng.random()) / w for w in self.weights(items, strength)]
+        return [items[idx] for idx in sorted(range(len(items)), key=keys.__getitem__, reverse=True)]
+
+    def sample(self, rng: random.Random, items: Sequence[str], k: int, strength: float) -> list[str]:
+        if k > len(items):
+            raise ValueError("Sample larger than population")
+        return self.order(rng, items, strength)[:k]
+
+    def choice(self, rng: random.Random, items: Sequence[str], strength: float) -> str:
+        return rng.choices(items, weights=self.weights(items, strength))[0]
+
+
+@lru_cache(maxsize=4)
+def load_corpus(path: Path) -> SeoCorpus:
+    files = sorted(path.glob("*.csv")) if path.is_dir() else [path]
+    if not files:
+        raise ValueError(f"{path}: no CSV files")
+    corpus = SeoCorpus([row for file in files for row in read_rows(file)], str(path))
+    if not len(corpus):
+        raise ValueError(f"{path}: no terms with search volume")
+    return corpus
@@ -0,0 +1,247 @@
+#!/usr/bin/env python3
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from datetime import date
+from pathlib import Path
+from urllib.parse import parse_qs, urlsplit
+
+import generate_packages as gp
+
+MAX_HEADER_BYTES = 16384
+REASONS = {200: "OK", 400: "Bad Request", 404: "Not Found", 405: "Method Not Allowed", 500: "Internal Server Error"}
+
+
+class RequestError(Exception):
+    def __init__(self, status: int, message: str) -> None:
+        super().__init__(message)
+        self.status = status
+
+
+@dataclass
+class WeekEntry:
+    contexts: list[gp.PackageContext]
+    artifacts: gp.WeekArtifacts
+    markdown: dict[str, str] = field(default_factory=dict)
+
+    def render(self, ctx: gp.PackageContext) -> str:
+        key = ctx.publish_date.isoformat()
+        found = self.markdown.get(key)
+        if found is None:
+            found = self.markdown[key] = gp.build_markdown(
+                ctx,
+                self.artifacts.phrase_map[key],
+                self.artifacts.story_map[key],
+                self.artifacts.tracklist_map[key],
+            )
+        return found
+
+
+class WeekCache:
+    def __init__(self, max_entries: int) -> None:
+        self.max_entries = max_entries
+        self.entries: OrderedDict[tuple[str, str], WeekEntry] = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.reloads = 0
+
+    def refresh(self) -> None:
+        if gp.refresh_pools():
+            self.entries.clear()
+            self.reloads += 1
+
+    def get(self, base: date) -> WeekEntry:
+        first_publish_date = gp.next_publish_dates(base, 1)[0][0]
+        key = (first_publish_date.isoformat(), gp.get_catalog().digest)
+        entry = self.entries.get(key)
+        if entry is not None:
+            self.hits += 1
+            self.entries.move_to_end(key)
+            return entry
+
+        self.misses += 1
+        contexts = gp.build_contexts(base)
+        entry = WeekEntry(contexts=contexts, artifacts=gp.build_week_artifacts(contexts))
+        self.entries[key] = entry
+        if len(self.entries) > self.max_entries:
+            self.entries.popitem(last=False)
+        return entry
+
+    def info(self) -> dict:
+        return {
+            "entries": len(self.entries),
+            "max_entries": self.max_entries,
+            "hits": self.hits,
+            "misses": self.misses,
+            "reloads": self.reloads,
+        }
+
+
+def context_record(ctx: gp.PackageContext) -> dict:
+    return {
+        "date": ctx.publish_date.isoformat(),
+        "weekday": ctx.weekday_label,
+        "series": ctx.series,
+        "keyword": ctx.keyword,
+        "duration_target": ctx.duration_target,
+        "filename": gp.package_filename(ctx),
+    }
+
+
+def query_base(query: dict[str, list[str]]) -> date:
+    raw = query.get("base", [None])[0]
+    try:
+        return gp.get_base_date(raw)
+    except ValueError:
+        raise RequestError(400, f"invalid base date '{raw}'") from None
+
+
+def select_context(entry: WeekEntry, query: dict[str, list[str]]) -> gp.PackageContext:
+    wanted_date = query.get("date", [None])[0]
+    wanted_series = query.get("series", [None])[0]
+    if not wanted_date and not wanted_series:
+        raise RequestError(400, "pass date=YYYY-MM-DD or series=<name> to pick a package")
+    for ctx in entry.contexts:
+        if wanted_date and ctx.publish_date.isoformat() != wanted_date:
+            continue
+        if wanted_series and gp.slugify_series(ctx.series) != gp.slugify_series(wanted_series):
+            continue
+        return ctx
+    raise RequestError(404, "no package for that date/series in this week")
+
+
+def handle(cache: WeekCache, method: str, target: str) -> tuple[int, str, str]:
+    if method != "GET":
+        raise RequestError(405, "only GET is supported")
+    url = urlsplit(target)
+    query = parse_qs(url.query)
+    cache.refresh()
+
+    if url.path == "/health":
+        body = {"status": "ok", "pool_hash": gp.get_catalog().digest, "cache": cache.info()}
+        return 200, "application/json", json.dumps(body)
+    if url.path == "/contexts":
+        contexts = gp.build_contexts(query_base(query))
+        return 200, "application/json", json.dumps([context_record(ctx) for ctx in contexts])
+    if url.path == "/week":
+        entry = cache.get(query_base(query))
+        packages = []
+        for ctx in entry.contexts:
+            key = ctx.publish_date.isoformat()
+            record = context_record(ctx)
+            record.update(
+                phrases=entry.artifacts.phrase_map[key],
+                story=entry.artifacts.story_map[key],
+                tracklist=entry.artifacts.tracklist_map[key],
+                primary_object=entry.artifacts.object_map.get(key),
+            )
+            packages.append(record)
+        return 200, "application/json", json.dumps({"pool_hash": gp.get_catalog().digest, "packages": packages})
+    if url.path == "/package":
+        entry = cache.get(query_base(query))
+        return 200, "text/markdown; charset=utf-8", entry.render(select_context(entry, query))
+    raise RequestError(404, f"unknown path '{url.path}'")
+
+
+async def read_request(reader: asyncio.StreamReader) -> tuple[str, str, dict[str, str]] | None:
+    try:
+        head = await reader.readuntil(b"\r\n\r\n")
+    except asyncio.IncompleteReadError:
+        return None
+    except asyncio.LimitOverrunError:
+        raise RequestError(400, "request header too large") from None
+    lines = head.decode("latin-1").split("\r\n")
+    parts = lines[0].split()
+    if len(parts) != 3:
+        raise RequestError(400, "malformed request line")
+    headers: dict[str, str] = {}
+    for line in lines[1:]:
+        name, sep, value = line.partition(":")
+        if sep:
+            headers[name.strip().lower()] = value.strip()
+    length = int(headers.get("content-length", "0") or 0)
+    if length:
+        await reader.readexactly(length)
+    return parts[0], parts[1], headers | {"_version": parts[2]}
+
+
+def encode_response(status: int, content_type: str, body: str, keep_alive: bool) -> bytes:
+    payload = body.encode("utf-8")
+    head = (
+        f"HTTP/1.1 {status} {REASONS.get(status, 'OK')}\r\n"
+        f"Content-Type: {content_type}\r\n"
+        f"Content-Length: {len(payload)}\r\n"
+        f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n"
+    )
+    return head.encode("latin-1") + payload
+
+
+async def serve_connection(cache: WeekCache, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+    try:
+        while True:
+            try:
+                request = await read_request(reader)
+                if request is None:
+                    break
+                method, target, headers = request
+                keep_alive = headers["_version"] == "HTTP/1.1" and headers.get("connection", "").lower() != "close"
+                status, content_type, body = handle(cache, method, target)
+            except RequestError as exc:
+                keep_alive = False
+                status, content_type, body = exc.status, "application/json", json.dumps({"error": str(exc)})
+            except Exception as exc:
+                keep_alive = False
+                status, content_type, body = 500, "application/json", json.dumps({"error": repr(exc)})
+            writer.write(encode_response(status, content_type, body, keep_alive))
+            await writer.drain()
+            if not keep_alive:
+                break
+    except (ConnectionError, asyncio.IncompleteReadError):
+        pass
+    finally:
+        writer.close()
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Serve NAD packages over local HTTP with an in-memory week cache")
+    parser.add_argument("--host", default="127.0.0.1", help="TCP host to bind.")
+    parser.add_argument("--port", type=int, default=8765, help="TCP port to bind.")
+    parser.add_argument("--socket", help="Unix socket path; overrides --host/--port.")
+    parser.add_argument("--cache-size", type=int, default=256, help="Maximum number of cached weeks.")
+    args = parser.parse_args()
+    if args.cache_size < 1:
+        parser.error("--cache-size must be at least 1")
+    return args
+
+
+async def serve(args: argparse.Namespace) -> None:
+    cache = WeekCache(args.cache_size)
+    gp.pool_index()
+
+    async def on_connect(reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        await serve_connection(cache, reader, writer)
+
+    if args.socket:
+        Path(args.socket).unlink(missing_ok=True)
+        server = await asyncio.start_unix_server(on_connect, path=args.socket, limit=MAX_HEADER_BYTES)
+        print(f"Serving on unix:{args.socket}", flush=True)
+    else:
+        server = await asyncio.start_server(on_connect, args.host, args.port, limit=MAX_HEADER_BYTES)
+        print(f"Serving on http://{args.host}:{args.port}", flush=True)
+    async with server:
+        await server.serve_forever()
+
+
+def main() -> None:
+    try:
+        asyncio.run(serve(parse_args()))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,196 @@
+#!/usr/bin/env python3
+from __future__ import annotations
+
+import argparse
+import hashlib
+import json
+import random
+from collections import defaultdict
+from dataclasses import dataclass
+from functools import lru_cache
+from pathlib import Path
+
+import generate_packages as gp
+
+NUM_PERM = 64
+BANDS = 32
+PRIME = (1 << 61) - 1
+INDEXED_POOLS = ["MELANCHOLIC_PHRASES", "SUNO_TRACKLINE_POOL", "CHAPTER_MOMENTS"]
+HISTORY_PREFIXES = {"title:": "history.titles", "line:": "history.tracklines"}
+
+
+@dataclass(frozen=True)
+class Entry:
+    source: str
+    text: str
+
+
+@lru_cache(maxsize=65536)
+def token_hash(token: str) -> int:
+    return int.from_bytes(hashlib.blake2b(token.encode("utf-8"), digest_size=8).digest(), "big")
+
+
+@lru_cache(maxsize=4)
+def permutations(num_perm: int) -> tuple[tuple[int, int], ...]:
+    rng = random.Random(num_perm)
+    return tuple((rng.randrange(1, PRIME), rng.randrange(PRIME)) for _ in range(num_perm))
+
+
+def overlap(a: frozenset[str], b: frozenset[str]) -> float:
+    if not a or not b:
+        return 0.0
+    return len(a & b) / min(len(a), len(b))
+
+
+class NearDuplicateIndex:
+    def __init__(self, threshold: float = gp.CLOSE_VARIANT_THRESHOLD, num_perm: int = NUM_PERM, bands: int = BANDS):
+        if num_perm % bands:
+            raise ValueError("num_perm must be a multiple of bands")
+        self.threshold = threshold
+        self.perms = permutations(num_perm)
+        self.rows = num_perm // bands
+        self.entries: list[Entry] = []
+        self.tokens: list[frozenset[str]] = []
+        self.buckets: list[dict[tuple[int, ...], list[int]]] = [defaultdict(list) for _ in range(bands)]
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    def signature(self, tokens: frozenset[str]) -> list[int]:
+        hashes = [token_hash(token) for token in tokens]
+        return [min((a * h + b) % PRIME for h in hashes) for a, b in self.perms]
+
+    def band_keys(self, tokens: frozenset[str]) -> list[tuple[int, ...]]:
+        sig = self.signature(tokens)
+        return [tuple(sig[i : i + self.rows]) for i in range(0, len(sig), self.rows)]
+
+    def add(self, source: str, text: str) -> int | None:
+        tokens = frozenset(gp.phrase_tokens(text))
+        if not tokens:
+            return None
+        idx = len(self.entries)
+        self.entries.append(Entry(source, text))
+        self.tokens.append(tokens)
+        for bucket, key in zip(self.buckets, self.band_keys(tokens)):
+            bucket[key].append(idx)
+        return idx
+
+    def candidates(self, tokens: frozenset[str]) -> set[int]:
+        found: set[int] = set()
+        for bucket, key in zip(self.buckets, self.band_keys(tokens)):
+            found.update(bucket.get(key, ()))
+        return found
+
+    def query(self, text: str) -> list[tuple[Entry, float]]:
+        tokens = frozenset(gp.phrase_tokens(text))
+        if not tokens:
+            return []
+        matches = []
+        for idx in self.candidates(tokens):
+            score = overlap(tokens, self.tokens[idx])
+            if score >= self.threshold:
+                matches.append((self.entries[idx], score))
+        return sorted(matches, key=lambda m: (-m[1], m[0].source, m[0].text))
+
+    def has_near_duplicate(self, text: str) -> bool:
+        tokens = frozenset(gp.phrase_tokens(text))
+        return bool(tokens) and any(
+            overlap(tokens, self.tokens[idx]) >= self.threshold for idx in self.candidates(tokens)
+        )
+
+    def clusters(self) -> list[list[Entry]]:
+        parent = list(range(len(self.entries)))
+
+        def find(i: int) -> int:
+            while parent[i] != i:
+                parent[i] = parent[parent[i]]
+                i = parent[i]
+            return i
+
+        for bucket in self.buckets:
+            for members in bucket.values():
+                for pos, i in enumerate(members):
+                    for j in members[pos + 1 :]:
+                        if find(i) != find(j) and overlap(self.tokens[i], self.tokens[j]) >= self.threshold:
+                            parent[find(i)] = find(j)
+
+        groups: dict[int, list[Entry]] = defaultdict(list)
+        for idx, entry in enumerate(self.entries):
+            groups[find(idx)].append(entry)
+        found = [sorted(group, key=lambda e: (e.source, e.text)) for group in groups.values() if len(group) > 1]
+        return sorted(found, key=lambda group: (-len(group), group[0].source, group[0].text))
+
+
+def pool_source(name: str) -> str:
+    return name.lower()
+
+
+def build_index(threshold: float = gp.CLOSE_VARIANT_THRESHOLD, history: dict[str, str] | None = None):
+    index = NearDuplicateIndex(threshold)
+    seen: set[str] = set()
+    for name in INDEXED_POOLS:
+        for text in getattr(gp, name):
+            index.add(pool_source(name), text)
+            seen.add(gp.normalize(text))
+    for text, source in sorted((history or {}).items()):
+        if text not in seen:
+            index.add(source, text)
+    return index
+
+
+def ledger_history(path: Path) -> dict[str, str]:
+    from nad_ledger import UsageLedger
+
+    history: dict[str, str] = {}
+    with UsageLedger(path) as ledger:
+        for prefix, source in HISTORY_PREFIXES.items():
+            for concept in ledger.concepts(prefix):
+                history.setdefault(concept[len(prefix) :], source)
+    return history
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Report near-duplicate titles, tracklines and chapter moments")
+    parser.add_argument("--threshold", type=float, default=gp.CLOSE_VARIANT_THRESHOLD, help="Token overlap cut-off.")
+    parser.add_argument("--ledger", help="Also index lines previously published according to this usage ledger.")
+    parser.add_argument("--query", action="append", default=[], help="Print near-duplicates of this text instead.")
+    parser.add_argument("--json", action="store_true", help="Emit the report as JSON.")
+    args = parser.parse_args()
+    if not 0 < args.threshold <= 1:
+        parser.error("--threshold must be in (0, 1]")
+    return args
+
+
+def main() -> None:
+    args = parse_args()
+    history = ledger_history(Path(args.ledger)) if args.ledger else None
+    index = build_index(args.threshold, history)
+    if args.query:
+        report = {
+            text: [{"source": e.source, "text": e.text, "overlap": round(score, 3)} for e, score in index.query(text)]
+            for text in args.query
+        }
+    else:
+        report = {
+            "entries": len(index),
+            "threshold": args.threshold,
+            "clusters": [[{"source": e.source, "text": e.text} for e in group] for group in index.clusters()],
+        }
+    if args.json:
+        print(json.dumps(report, indent=2))
+        return
+    if args.query:
+        for text, matches in report.items():
+            print(f"{text}: {len(matches)} near-duplicate(s)")
+            for match in matches:
+                print(f"  {match['overlap']:.2f}  [{match['source']}] {match['text']}")
+        return
+    for n, group in enumerate(report["clusters"], 1):
+        print(f"cluster {n} ({len(group)} entries)")
+        for item in group:
+            print(f"  [{item['source']}] {item['text']}")
+    print(f"{len(report['clusters'])} clusters across {report['entries']} entries")
+
+
+if __name__ == "__main__":
+    main()
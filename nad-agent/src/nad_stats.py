@@ -0,0 +1,101 @@
+from __future__ import annotations
+
+import sys
+import time
+from collections.abc import Iterable, Iterator
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+
+
+@dataclass
+class RunStats:
+    counters: dict[str, int] = field(default_factory=dict)
+    wall: dict[str, float] = field(default_factory=dict)
+    cpu: dict[str, float] = field(default_factory=dict)
+    calls: dict[str, int] = field(default_factory=dict)
+    used: dict[str, set[str]] = field(default_factory=dict)
+    peaks: dict[str, float] = field(default_factory=dict)
+
+    def incr(self, name: str, amount: int = 1) -> None:
+        self.counters[name] = self.counters.get(name, 0) + amount
+
+    def peak(self, name: str, value: float) -> None:
+        if value > self.peaks.get(name, float("-inf")):
+            self.peaks[name] = value
+
+    def use(self, pool: str, items: Iterable[str]) -> None:
+        self.used.setdefault(pool, set()).update(items)
+
+    @contextmanager
+    def stage(self, name: str) -> Iterator[None]:
+        wall_start = time.perf_counter()
+        cpu_start = time.process_time()
+        try:
+            yield
+        finally:
+            self.wall[name] = self.wall.get(name, 0.0) + time.perf_counter() - wall_start
+            self.cpu[name] = self.cpu.get(name, 0.0) + time.process_time() - cpu_start
+            self.calls[name] = self.calls.get(name, 0) + 1
+
+    def snapshot(self) -> dict:
+        return {
+            "counters": dict(self.counters),
+            "wall": dict(self.wall),
+            "cpu": dict(self.cpu),
+            "calls": dict(self.calls),
+            "used": {pool: sorted(items) for pool, items in self.used.items()},
+            "peaks": dict(self.peaks),
+        }
+
+    def merge(self, snapshot: dict) -> None:
+        for name, value in snapshot["counters"].items():
+            self.counters[name] = self.counters.get(name, 0) + value
+        for target, source in ((self.wall, snapshot["wall"]), (self.cpu, snapshot["cpu"])):
+            for name, value in source.items():
+                target[name] = target.get(name, 0.0) + value
+        for name, value in snapshot["calls"].items():
+            self.calls[name] = self.calls.get(name, 0) + value
+        for pool, items in snapshot["used"].items():
+            self.use(pool, items)
+        for name, value in snapshot["peaks"].items():
+            self.peak(name, value)
+
+    def report(self, pool_sizes: dict[str, int]) -> dict:
+        return {
+            "stages": {
+                name: {
+                    "calls": self.calls[name],
+                    "wall_seconds": round(self.wall[name], 6),
+                    "cpu_seconds": round(self.cpu[name], 6),
+                }
+                for name in sorted(self.wall)
+            },
+            "counters": dict(sorted(self.counters.items())),
+            "peaks": {name: round(value, 4) for name, value in sorted(self.peaks.items())},
+            "pools": {
+                pool: {
+                    "size": size,
+                    "used": len(self.used.get(pool, ())),
+                    "consumed": round(len(self.used.get(pool, ())) / size, 4) if size else 0.0,
+                }
+                for pool, size in sorted(pool_sizes.items())
+            },
+        }
+
+
+def print_report(report: dict) -> None:
+    out = sys.stderr
+    print("stage                          calls     wall(ms)      cpu(ms)", file=out)
+    for name, row in report["stages"].items():
+        print(
+            f"{name:<30} {row['calls']:>5} {row['wall_seconds'] * 1000:>12.2f} {row['cpu_seconds'] * 1000:>12.2f}",
+            file=out,
+        )
+    print("\ncounter                                          value", file=out)
+    for name, value in report["counters"].items():
+        print(f"{name:<44} {value:>9}", file=out)
+    for name, value in report["peaks"].items():
+        print(f"{name:<44} {value:>9.1%}", file=out)
+    print("\npool                       used / size   consumed", file=out)
+    for pool, row in report["pools"].items():
+        print(f"{pool:<24} {row['used']:>6} / {row['size']:<6} {row['consumed']:>8.1%}", file=out)
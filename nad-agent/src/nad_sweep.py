@@ -0,0 +1,199 @@
+#!/usr/bin/env python3
+from __future__ import annotations
+
+import argparse
+import os
+import sys
+import time
+from collections import Counter
+from dataclasses import dataclass, field
+from datetime import date, timedelta
+from pathlib import Path
+
+import generate_packages as gp
+from nad_validate import validate_markdown
+
+INDEX_MAGIC = "# nad-sweep 1"
+INFEASIBLE = "INFEASIBLE"
+
+
+@dataclass
+class RunResult:
+    first_date: str
+    packages: list[tuple[str, str]] = field(default_factory=list)
+    violations: list[tuple[str, str, str]] = field(default_factory=list)
+    failure: str | None = None
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Sweep every base date in a range for determinism and feasibility")
+    parser.add_argument("--from", dest="from_date", default="2025-01-01", help="First base date (YYYY-MM-DD).")
+    parser.add_argument("--to", dest="to_date", default="2075-12-31", help="Last base date (YYYY-MM-DD).")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1, help="Worker processes.")
+    parser.add_argument("--channel", help="Channel config JSON; defaults to NAD.")
+    parser.add_argument("--seed-scheme", choices=gp.SEED_SCHEMES, default="v1", help="Seed derivation to sweep.")
+    parser.add_argument("--phrase-source", choices=gp.PHRASE_SOURCES, default="pool", help="Phrase source to sweep.")
+    parser.add_argument("--seo-corpus", help="Keyword CSV export (or directory) to sweep SEO-biased selection with.")
+    parser.add_argument("--index", help="Write the golden-hash index of every package here.")
+    parser.add_argument("--against", help="Diff this run against a previously written index.")
+    parser.add_argument("--limit", type=int, default=20, help="Changed or infeasible runs to list in the report.")
+    args = parser.parse_args()
+    if args.workers < 1:
+        parser.error("--workers must be at least 1")
+    try:
+        args.start = date.fromisoformat(args.from_date)
+        args.end = date.fromisoformat(args.to_date)
+        args.channel_config = gp.load_channel(Path(args.channel)) if args.channel else gp.DEFAULT_CHANNEL
+        gp.set_seo_corpus(args.seo_corpus)
+    except (OSError, ValueError) as exc:
+        parser.error(str(exc))
+    if args.end < args.start:
+        parser.error("--to must not be before --from")
+    return args
+
+
+def sweep_bases(start: date, end: date, channel: gp.Channel = gp.DEFAULT_CHANNEL) -> list[date]:
+    one_day = timedelta(days=1)
+    return [slot.date - one_day for slot in channel.calendar.between(start + one_day, end + one_day)]
+
+
+def sweep_run(base: date, channel: gp.Channel = gp.DEFAULT_CHANNEL) -> RunResult:
+    contexts = gp.build_contexts(base, channel)
+    result = RunResult(first_date=contexts[0].publish_date.isoformat())
+    try:
+        artifacts = gp.build_week_artifacts(contexts)
+    except RuntimeError as exc:
+        result.failure = str(exc)
+        return result
+    for filename, markdown in gp.render_artifacts(contexts, artifacts):
+        result.packages.append((filename, gp.content_hash(markdown)[:16]))
+        for violation in validate_markdown(markdown, filename, channel):
+            if violation.severity == "error":
+                result.violations.append((filename, violation.rule, violation.message))
+    return result
+
+
+def _sweep_chunk(job: tuple[list[date], gp.Channel, dict[str, str]]) -> list[RunResult]:
+    bases, channel, settings = job
+    gp.apply_generation_settings(settings)
+    return [sweep_run(base, channel) for base in bases]
+
+
+def sweep(bases: list[date], channel: gp.Channel = gp.DEFAULT_CHANNEL, workers: int = 1) -> list[RunResult]:
+    if workers <= 1 or len(bases) < 2:
+        return [sweep_run(base, channel) for base in bases]
+    from concurrent.futures import ProcessPoolExecutor
+
+    size = max(1, len(bases) // (workers * 8))
+    settings = gp.generation_settings()
+    jobs = [(bases[i : i + size], channel, settings) for i in range(0, len(bases), size)]
+    with ProcessPoolExecutor(max_workers=min(workers, len(jobs))) as pool:
+        return [result for chunk in pool.map(_sweep_chunk, jobs) for result in chunk]
+
+
+def index_header(channel: gp.Channel) -> str:
+    settings = gp.generation_settings()
+    header = (
+        f"{INDEX_MAGIC} generator={gp.GENERATOR_VERSION} pool_hash={channel.pool_hash()[:16]} "
+        f"seed_scheme={settings['seed_scheme']} phrase_source={settings['phrase_source']} channel={channel.name}"
+    )
+    if "seo_snapshot" in settings:
+        header += f" seo={settings['seo_snapshot']}:{settings['seo_strength']}"
+    return header
+
+
+def index_entries(results: list[RunResult]) -> dict[str, str]:
+    entries: dict[str, str] = {}
+    for result in results:
+        if result.failure is not None:
+            entries[f"{result.first_date}\t-"] = INFEASIBLE
+        for filename, digest in result.packages:
+            entries[f"{result.first_date}\t{filename}"] = digest
+    return entries
+
+
+def write_index(path: Path, header: str, entries: dict[str, str]) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    lines = [header, *(f"{key}\t{digest}" for key, digest in entries.items())]
+    gp.atomic_write_bytes(path, ("\n".join(lines) + "\n").encode("utf-8"))
+
+
+def read_index(path: Path) -> tuple[str, dict[str, str]]:
+    header = ""
+    entries: dict[str, str] = {}
+    for line in path.read_text(encoding="utf-8").splitlines():
+        if line.startswith("#"):
+            header = line
+            continue
+        first_date, filename, digest = line.split("\t")
+        entries[f"{first_date}\t{filename}"] = digest
+    if not header.startswith(INDEX_MAGIC):
+        raise ValueError(f"{path} is not a sweep index")
+    return header, entries
+
+
+def diff_runs(old: dict[str, str], new: dict[str, str]) -> dict[str, list[str]]:
+    runs: dict[str, set[str]] = {"changed": set(), "added": set(), "removed": set(), "broken": set(), "fixed": set()}
+    for key in old.keys() | new.keys():
+        first_date, filename = key.split("\t")
+        before, after = old.get(key), new.get(key)
+        if before == after:
+            continue
+        if filename == "-":
+            runs["broken" if after == INFEASIBLE else "fixed"].add(first_date)
+        elif before is None:
+            runs["added"].add(first_date)
+        elif after is None:
+            runs["removed"].add(first_date)
+        else:
+            runs["changed"].add(first_date)
+    runs["added"] -= runs["fixed"]
+    runs["removed"] -= runs["broken"]
+    return {kind: sorted(dates) for kind, dates in runs.items()}
+
+
+def main() -> None:
+    args = parse_args()
+    gp.set_seed_scheme(args.seed_scheme)
+    gp.set_phrase_source(args.phrase_source)
+    channel = args.channel_config
+    bases = sweep_bases(args.start, args.end, channel)
+    started = time.perf_counter()
+    results = sweep(bases, channel, args.workers)
+    elapsed = time.perf_counter() - started
+
+    entries = index_entries(results)
+    header = index_header(channel)
+    infeasible = [result.first_date for result in results if result.failure is not None]
+    violations = [v for result in results for v in result.violations]
+    packages = sum(len(result.packages) for result in results)
+    print(f"{len(results)} runs, {packages} packages in {elapsed:.1f}s ({args.workers} workers)")
+    print(f"infeasible runs: {len(infeasible)}")
+    for first_date in infeasible[: args.limit]:
+        print(f"  {first_date}")
+    print(f"template violations: {len(violations)}")
+    for rule, count in Counter(rule for _, rule, _ in violations).most_common():
+        print(f"  {rule}: {count}")
+
+    changed = False
+    if args.against:
+        old_header, old_entries = read_index(Path(args.against))
+        if results:
+            lo, hi = results[0].first_date, results[-1].first_date
+            old_entries = {key: digest for key, digest in old_entries.items() if lo <= key[:10] <= hi}
+        if old_header != header:
+            print(f"index settings differ:\n  was {old_header}\n  now {header}")
+        for kind, dates in diff_runs(old_entries, entries).items():
+            changed = changed or bool(dates)
+            print(f"{kind} runs: {len(dates)}")
+            for first_date in dates[: args.limit]:
+                print(f"  {first_date}")
+    if args.index:
+        write_index(Path(args.index), header, entries)
+        print(f"index: {args.index} ({len(entries)} entries)")
+    if infeasible or violations or changed:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,333 @@
+#!/usr/bin/env python3
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import re
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import asdict, dataclass, field
+from datetime import date
+from itertools import repeat
+from pathlib import Path
+
+import generate_packages as gp
+from nad_calendar import WEEKDAY_LABELS, Calendar
+
+FRONTMATTER_KEYS = ["date", "weekday", "series", "keyword", "duration_target"]
+REQUIRED_SECTIONS = [
+    "Titles",
+    "Noir micro-story",
+    "SEO paragraph",
+    "About NAD",
+    "Tags (22–30)",
+    "Chapters (template)",
+    "Suno Tracklist (Song-Title Lines)",
+    "Pinned comment",
+    "3 engagement comments",
+    "Thumbnail prompts (NAD style)",
+]
+BANNED_WORDS = {"detective", "dossier", "thriller", "murder", "crime", "killer", "case file"}
+THUMBNAIL_MARKERS = ["16:9 YouTube thumbnail composition", "no text, no visible face, no logos"]
+MOOD_ARC = "Mood Arc: Warm Open → Quiet Confession → Last Call"
+REMINDER = "> Replace timestamps after final mix export."
+EMOJI = re.compile("[\U0001F300-\U0001FAFF☀-➿]")
+TITLE_LINE = re.compile(r"- \*\*(Final title|Alternate \d):\*\* (.+)$")
+NUMBERED = re.compile(r"(\d+)\. (.+)$")
+VARIANT_SUFFIX = re.compile(r"_([b-z])\.md$")
+
+
+@dataclass
+class Violation:
+    file: str
+    rule: str
+    message: str
+    severity: str = "error"
+
+
+@dataclass
+class ParsedPackage:
+    frontmatter: dict[str, str] = field(default_factory=dict)
+    sections: dict[str, list[str]] = field(default_factory=dict)
+
+
+def parse_package(text: str) -> ParsedPackage:
+    parsed = ParsedPackage()
+    lines = text.splitlines()
+    section: str | None = None
+    in_frontmatter = bool(lines) and lines[0] == "---"
+    for idx, line in enumerate(lines):
+        if in_frontmatter:
+            if idx == 0:
+                continue
+            if line == "---":
+                in_frontmatter = False
+                continue
+            key, sep, value = line.partition(":")
+            if sep:
+                parsed.frontmatter[key.strip()] = value.strip()
+            continue
+        if line.startswith("#"):
+            section = line.lstrip("#").strip()
+            parsed.sections.setdefault(section, [])
+            continue
+        if section is not None and line.strip():
+            parsed.sections[section].append(line)
+    return parsed
+
+
+def is_title_case(text: str) -> bool:
+    return text == text.title()
+
+
+def words(text: str) -> int:
+    return len(text.split())
+
+
+def validate_markdown(text: str, name: str = "<package>", channel: gp.Channel | None = None) -> list[Violation]:
+    return validate_package(parse_package(text), name, channel)
+
+
+def validate_package(
+    parsed: ParsedPackage,
+    name: str = "<package>",
+    channel: gp.Channel | None = None,
+) -> list[Violation]:
+    channel = channel or gp.DEFAULT_CHANNEL
+    out: list[Violation] = []
+
+    def fail(rule: str, message: str, severity: str = "error") -> None:
+        out.append(Violation(file=name, rule=rule, message=message, severity=severity))
+
+    fm = parsed.frontmatter
+    for key in FRONTMATTER_KEYS:
+        if not fm.get(key):
+            fail("frontmatter.missing", f"missing frontmatter key '{key}'")
+    if fm.get("date"):
+        try:
+            publish_date = date.fromisoformat(fm["date"])
+        except ValueError:
+            fail("frontmatter.date", f"invalid date '{fm['date']}'")
+        else:
+            if fm.get("weekday") and fm["weekday"] != WEEKDAY_LABELS[publish_date.weekday()]:
+                fail("frontmatter.weekday", f"weekday '{fm['weekday']}' does not match {fm['date']}")
+            if not channel.calendar.is_slot(publish_date):
+                fail("frontmatter.date", f"{fm['date']} is not a publish slot for channel '{channel.name}'")
+    if fm.get("series") and fm["series"] not in channel.series:
+        fail("frontmatter.series", f"unknown series '{fm['series']}'")
+    if fm.get("duration_target") and not re.fullmatch(r"\d+:\d{2}:\d{2}", fm["duration_target"]):
+        fail("frontmatter.duration_target", f"invalid duration '{fm['duration_target']}'")
+
+    for header in REQUIRED_SECTIONS:
+        if header not in parsed.sections:
+            fail("section.missing", f"missing section '{header}'")
+
+    sections = parsed.sections
+    titles = [m.group(2) for line in sections.get("Titles", []) if (m := TITLE_LINE.match(line))]
+    if len(titles) != 3:
+        fail("titles.count", f"expected 1 final + 2 alternate titles, found {len(titles)}")
+    phrases: list[str] = []
+    for title in titles:
+        phrase, sep, suffix = title.partition(" | ")
+        if not sep or suffix != channel.title_suffix:
+            fail("titles.format", f"title does not end with '| {channel.title_suffix}': {title}")
+            continue
+        phrases.append(phrase)
+        if not 3 <= words(phrase) <= 9:
+            fail("titles.words", f"title phrase must be 3–9 words: {phrase}")
+        if not is_title_case(phrase):
+            fail("titles.title_case", f"title phrase is not Title Case: {phrase}")
+        if any(w in phrase.lower() for w in BANNED_WORDS):
+            fail("titles.framing", f"detective/thriller framing in title: {phrase}")
+
+    story = sections.get("Noir micro-story", [])
+    quotes = [line for line in story if line.startswith('"') and line.endswith('"')]
+    if not 8 <= len(story) <= 12:
+        fail("story.lines", f"micro-story must have 8–12 lines, found {len(story)}")
+    if not 4 <= len(quotes) <= 6:
+        fail("story.quotes", f"micro-story must have 4–6 overheard quotes, found {len(quotes)}")
+    narrative = [line for line in story if line not in quotes]
+    if narrative and not any(re.search(r"\bI\b", line) for line in narrative):
+        fail("story.pov", "micro-story has no first-person bartender line", "warning")
+
+    seo = " ".join(sections.get("SEO paragraph", [])).lower()
+    for keyword in ("noir jazz", "late-night bar ambience"):
+        if keyword not in seo:
+            fail("seo.keyword", f"SEO paragraph missing '{keyword}'")
+    if not any(context in seo for context in channel.pool("seo_context")):
+        fail("seo.context", "SEO paragraph missing a reading/studying/work context")
+
+    about = sections.get("About NAD", [])
+    if not 2 <= len(about) <= 3:
+        fail("about.lines", f"About NAD must have 2–3 lines, found {len(about)}")
+    if len(sections.get("Optional late-hours line", [])) > 1:
+        fail("late_line.lines", "optional late-hours line must be a single line")
+
+    tags = [t.strip() for line in sections.get("Tags (22–30)", []) for t in line.split(",") if t.strip()]
+    if not 22 <= len(tags) <= 30:
+        fail("tags.count", f"expected 22–30 tags, found {len(tags)}")
+    if len(set(tags)) != len(tags):
+        fail("tags.duplicate", "duplicate tags")
+    for tag in tags:
+        if any(w in tag.lower() for w in BANNED_WORDS):
+            fail("tags.framing", f"thriller/true-crime tag: {tag}")
+
+    chapters_section = sections.get("Chapters (template)", [])
+    chapters = [line for line in chapters_section if re.match(r"- \d+:\d{2}(:\d{2})? ", line)]
+    if REMINDER not in chapters_section:
+        fail("chapters.reminder", "missing 'Replace timestamps after final mix export.' reminder")
+    if not 10 <= len(chapters) <= 12:
+        fail("chapters.count", f"expected 10–12 chapter lines, found {len(chapters)}")
+
+    suno = sections.get("Suno Tracklist (Song-Title Lines)", [])
+    if MOOD_ARC not in suno:
+        fail("tracklist.mood_arc", "missing Mood Arc line")
+    tracks = [m.group(2) for line in suno if (m := NUMBERED.match(line))]
+    if len(tracks) != 18:
+        fail("tracklist.count", f"expected exactly 18 track lines, found {len(tracks)}")
+    if len(set(tracks)) != len(tracks):
+        fail("tracklist.duplicate", "duplicate track lines")
+    title_keys = {gp.normalize(p) for p in phrases}
+    for line in tracks:
+        if not 3 <= words(line) <= 9:
+            fail("tracklist.words", f"track line must be 3–9 words: {line}")
+        if not is_title_case(line):
+            fail("tracklist.title_case", f"track line is not Title Case: {line}")
+        if EMOJI.search(line):
+            fail("tracklist.emoji", f"emoji in track line: {line}")
+        if gp.normalize(line) in title_keys:
+            fail("tracklist.title_repeat", f"track line repeats a video title: {line}")
+        elif any(gp.close_variant(line, p) for p in phrases):
+            fail("tracklist.title_variant", f"track line is a close variant of a title: {line}", "warning")
+    if sum(line.startswith("I ") for line in tracks) > 3:
+        fail("tracklist.i_starts", "more than 3 track lines start with 'I'")
+    if sum(gp.starts_with_you_or_question(line) for line in tracks) < 3:
+        fail("tracklist.you_or_question", "fewer than 3 track lines start with 'You' or are questions")
+
+    if not sections.get("Pinned comment"):
+        fail("community.pinned", "missing pinned comment")
+    engagement = [line for line in sections.get("3 engagement comments", []) if NUMBERED.match(line)]
+    if len(engagement) != 3:
+        fail("community.engagement", f"expected 3 engagement comments, found {len(engagement)}")
+
+    thumbnails = [line for line in sections.get("Thumbnail prompts (NAD style)", []) if line.startswith("- Variant")]
+    if len(thumbnails) != 3:
+        fail("thumbnails.count", f"expected 3 thumbnail variants, found {len(thumbnails)}")
+    for line in thumbnails:
+        for marker in THUMBNAIL_MARKERS:
+            if marker not in line:
+                fail("thumbnails.marker", f"thumbnail prompt missing '{marker}'")
+    return out
+
+
+def publish_date_of(parsed: ParsedPackage) -> date | None:
+    try:
+        return date.fromisoformat(parsed.frontmatter.get("date", ""))
+    except ValueError:
+        return None
+
+
+def run_keys(dated: dict[str, date], calendar: Calendar) -> dict[str, str]:
+    # The generator builds one run from consecutive slots, so count runs from the earliest slot in the directory.
+    if not dated:
+        return {}
+    first = calendar.index(min(dated.values()))
+    size = calendar.slots_per_week
+    keys: dict[str, str] = {}
+    for name, day in dated.items():
+        start = first + (calendar.index(day) - first) // size * size
+        variant = VARIANT_SUFFIX.search(name)
+        keys[name] = f"run {calendar.slot(start).date}" + (f" variant {variant.group(1)}" if variant else "")
+    return keys
+
+
+def _validate_file(path: str, channel: gp.Channel) -> tuple[str, list[dict], date | None, list[str]]:
+    parsed = parse_package(Path(path).read_text(encoding="utf-8"))
+    name = Path(path).name
+    suno = parsed.sections.get("Suno Tracklist (Song-Title Lines)", [])
+    tracks = [m.group(2) for line in suno if (m := NUMBERED.match(line))]
+    return name, [asdict(v) for v in validate_package(parsed, name, channel)], publish_date_of(parsed), tracks
+
+
+def run_duplicates(runs: dict[str, dict[str, list[str]]]) -> list[Violation]:
+    out: list[Violation] = []
+    for run, files in sorted(runs.items()):
+        seen: dict[str, str] = {}
+        for name, tracks in sorted(files.items()):
+            for line in tracks:
+                first = seen.setdefault(gp.normalize(line), name)
+                if first != name:
+                    out.append(
+                        Violation(
+                            file=name,
+                            rule="week.tracklist_repeat",
+                            message=f"track line also used in {first} ({run}): {line}",
+                            severity="warning",
+                        )
+                    )
+    return out
+
+
+def validate_directory(directory: Path, workers: int = 1, channel: gp.Channel | None = None) -> dict:
+    channel = channel or gp.DEFAULT_CHANNEL
+    paths = [str(p) for p in sorted(directory.glob("*.md"))]
+    violations: list[dict] = []
+    dated: dict[str, date] = {}
+    tracklists: dict[str, list[str]] = {}
+
+    def collect(results) -> None:
+        for name, found, publish_date, tracks in results:
+            violations.extend(found)
+            if publish_date is not None and channel.calendar.is_slot(publish_date):
+                dated[name] = publish_date
+                tracklists[name] = tracks
+
+    if workers <= 1 or len(paths) < 2:
+        collect(map(_validate_file, paths, repeat(channel)))
+    else:
+        chunksize = max(1, len(paths) // (workers * 4))
+        with ProcessPoolExecutor(max_workers=min(workers, len(paths))) as pool:
+            collect(pool.map(_validate_file, paths, repeat(channel), chunksize=chunksize))
+    runs: dict[str, dict[str, list[str]]] = {}
+    for name, key in run_keys(dated, channel.calendar).items():
+        runs.setdefault(key, {})[name] = tracklists[name]
+    violations.extend(asdict(v) for v in run_duplicates(runs))
+
+    errors = sum(v["severity"] == "error" for v in violations)
+    return {
+        "files": len(paths),
+        "errors": errors,
+        "warnings": len(violations) - errors,
+        "violations": violations,
+    }
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Validate NAD package markdown against the package template")
+    parser.add_argument("directory", nargs="?", default="nad-agent/packages", help="Directory of package markdown.")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1, help="Worker processes.")
+    parser.add_argument("--json", dest="json_path", help="Write the JSON report here instead of stdout.")
+    parser.add_argument("--channel", dest="channel_file", help="Channel config JSON the packages were generated for.")
+    args = parser.parse_args()
+    try:
+        args.channel = gp.load_channel(Path(args.channel_file)) if args.channel_file else gp.DEFAULT_CHANNEL
+    except (OSError, ValueError) as exc:
+        parser.error(str(exc))
+    return args
+
+
+def main() -> None:
+    args = parse_args()
+    report = validate_directory(Path(args.directory), workers=args.workers, channel=args.channel)
+    payload = json.dumps(report, indent=2, ensure_ascii=False) + "\n"
+    if args.json_path:
+        Path(args.json_path).write_text(payload, encoding="utf-8")
+        print(f"{report['files']} files, {report['errors']} errors, {report['warnings']} warnings", file=sys.stderr)
+    else:
+        sys.stdout.write(payload)
+    sys.exit(1 if report["errors"] else 0)
+
+
+if __name__ == "__main__":
+    main()
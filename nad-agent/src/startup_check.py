@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+from __future__ import annotations
+
+import argparse
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+SRC_DIR = Path(__file__).resolve().parent
+SCRIPT = SRC_DIR / "generate_packages.py"
+CHECK_BASE_DATE = "2026-01-05"
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Report generator import time and enforce a CLI startup budget")
+    parser.add_argument("--runs", type=int, default=5, help="Imports and CLI invocations to time; the fastest is kept.")
+    parser.add_argument("--budget-ms", type=float, default=400.0, help="Fail when the fastest CLI run exceeds this.")
+    parser.add_argument("--import-budget-ms", type=float, default=100.0, help="Fail when importing the module exceeds this.")
+    parser.add_argument("--top", type=int, default=15, help="Number of slowest imports to list.")
+    args = parser.parse_args()
+    if args.runs < 1:
+        parser.error("--runs must be at least 1")
+    return args
+
+
+def import_sample() -> list[tuple[int, int, str]]:
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import generate_packages"],
+        cwd=SRC_DIR,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    rows: list[tuple[int, int, str]] = []
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        self_us, cumulative_us, name = (part.strip() for part in line[len("import time:") :].split("|"))
+        if self_us.isdigit():
+            rows.append((int(self_us), int(cumulative_us), name))
+    return rows
+
+
+def module_us(rows: list[tuple[int, int, str]]) -> int:
+    return next(cumulative for _, cumulative, name in rows if name.strip() == "generate_packages")
+
+
+def import_times(runs: int) -> list[tuple[int, int, str]]:
+    import_sample()
+    return min((import_sample() for _ in range(runs)), key=module_us)
+
+
+def time_cli(runs: int) -> float:
+    best = float("inf")
+    with tempfile.TemporaryDirectory() as tmp:
+        env = dict(os.environ, NAD_CATALOG_CACHE=str(Path(tmp) / "catalog"))
+        cmd = [sys.executable, str(SCRIPT), "--base-date", CHECK_BASE_DATE, "--output-dir", str(Path(tmp) / "out")]
+        subprocess.run(cmd, env=env, capture_output=True, check=True)
+        for _ in range(runs):
+            start = time.perf_counter()
+            subprocess.run(cmd, env=env, capture_output=True, check=True)
+            best = min(best, time.perf_counter() - start)
+    return best * 1000
+
+
+def main() -> None:
+    args = parse_args()
+    rows = import_times(args.runs)
+    module_ms = module_us(rows) / 1000
+    print(f"{'self(ms)':>9} {'cumul(ms)':>10}  module")
+    for self_us, cumulative_us, name in sorted(rows, key=lambda r: r[1], reverse=True)[: args.top]:
+        print(f"{self_us / 1000:>9.2f} {cumulative_us / 1000:>10.2f}  {name.strip()}")
+
+    cli_ms = time_cli(args.runs)
+    print(f"\nimport generate_packages, best of {args.runs}: {module_ms:.1f}ms (budget {args.import_budget_ms:.0f}ms)")
+    print(f"CLI run, best of {args.runs}: {cli_ms:.1f}ms (budget {args.budget_ms:.0f}ms)")
+
+    failures = []
+    if module_ms > args.import_budget_ms:
+        failures.append("import")
+    if cli_ms > args.budget_ms:
+        failures.append("CLI")
+    if failures:
+        print(f"Startup budget exceeded: {', '.join(failures)}", file=sys.stderr)
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()